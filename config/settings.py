@@ -13,20 +13,145 @@ MODEL_ANALYZER_FALLBACK = "gemini-1.5-pro"
 # Only articles with importance_score >= this value get deep analysis
 IMPORTANCE_THRESHOLD = 3
 
-# Rate limiting (seconds between API calls)
-# With billing enabled, 0.5s is safe and fast
-API_CALL_DELAY = 0.5
+# Rate limiting: shared per-model budget (requests / tokens per minute) for concurrent analysis
+MODEL_RATE_LIMITS = {
+    MODEL_FILTER_ID: {"rpm": 2000, "tpm": 2_000_000},
+    MODEL_ANALYZER_ID: {"rpm": 500, "tpm": 1_000_000},
+    MODEL_ANALYZER_FALLBACK: {"rpm": 500, "tpm": 1_000_000},
+    "default": {"rpm": 60, "tpm": 1_000_000},
+}
+# Articles analyzed in parallel (bounded by the budget above)
+ANALYZER_MAX_WORKERS = 8
+
+# Batched Tier 1: articles per gatekeeper call, bounded by estimated input tokens
+FILTER_BATCH_TOKEN_BUDGET = 4000
+FILTER_BATCH_MAX_ITEMS = 30
+
+# Persistent LLM response cache (STATE_DIR/llm_cache.sqlite); set LLM_CACHE_BYPASS=1 to re-score
+LLM_CACHE_ENABLED = True
+LLM_CACHE_MAX_ENTRIES = 20000
+LLM_CACHE_MAX_AGE_DAYS = 30
+
+# Token estimate for budgeting (Korean text averages ~2 chars per token)
+CHARS_PER_TOKEN = 2
+
+# --- Analysis ---
+# Rule-first routing: categories that always get Tier 2 analysis (value = importance score assigned)
+RULE_ANALYZE_CATEGORIES = {
+    "sanction_notice": 4,
+}
+
+# Tier-2 model router: circuit breaker on the primary analyzer model, optional hedging to the fallback
+MODEL_ROUTER_FAILURE_THRESHOLD = 3      # consecutive primary failures before the circuit opens
+MODEL_ROUTER_RESET_SECONDS = 120        # how long the fallback takes all traffic before a trial call
+MODEL_ROUTER_PRIMARY_RETRIES = 2        # one backoff retry (e.g. a transient 429) before failing over
+MODEL_ROUTER_HEDGE_ENABLED = False      # send a duplicate request to the fallback when the primary is slow
+MODEL_ROUTER_HEDGE_QUANTILE = 0.95      # ...once it has run longer than this latency percentile
+MODEL_ROUTER_HEDGE_MIN_SAMPLES = 20     # primary latencies needed before hedging kicks in
+MODEL_ROUTER_LATENCY_WINDOW = 200       # recent successful calls kept per model for percentiles
+
+# Tier-2 content condensation (boilerplate patterns in config/boilerplate_patterns.json)
+CONDENSER_TOKEN_BUDGET = 1500           # estimated tokens of article body sent to Tier 2
+CONDENSER_MAX_PARAGRAPH_CHARS = 600     # lines are merged into paragraphs up to this length
+
+# Local pre-classifier in front of Tier 1 (train with scripts/admin/train_preclassifier.py)
+PRECLASSIFIER_ENABLED = True
+PRECLASSIFIER_MODEL_PATH = "config/preclassifier_model.json"
+PRECLASSIFIER_CONFIDENCE = 0.95         # P <= 1 - this skips the gatekeeper call (score 1)
+PRECLASSIFIER_SKIP_POSITIVES = False    # also skip it for P >= this; enable only after checking positive_precision
+
+# --- Pipeline Stages ---
+# Streaming pipeline (collect -> dedup -> triage -> fetch -> analyze -> save -> notify)
+STAGE_QUEUE_SIZE = 200                  # bounded queue in front of every stage
+STAGE_WORKERS = {
+    "triage": 2,                        # batched Tier 1 calls in flight
+    "fetch": 4,                         # article bodies (per-host caps still apply in the fetcher)
+    "analyze": ANALYZER_MAX_WORKERS,    # Tier 2 calls in flight
+}
+STAGE_TRIAGE_LINGER_SECONDS = 2.0       # wait this long to fill a Tier 1 batch
+STAGE_SAVE_IDLE_SECONDS = 2.0           # flush buffered rows (and alert) once the save queue is idle this long
+
+# --- Priority ---
+# Processing priority (higher first); agency weights live in agencies.json "priority_weight"
+PRIORITY_DEFAULT_AGENCY_WEIGHT = 1.0
+PRIORITY_CATEGORY_WEIGHTS = {
+    "press_release": 2.0,
+    "regulation_notice": 1.5,
+    "sanction_notice": 1.0,
+}
+PRIORITY_RECENCY_BONUS = [(6, 2.0), (24, 1.0)]  # (max age in hours, bonus), first match wins
+PRIORITY_ROUTINE_PENALTY = 3.0          # routine keywords (bond auctions, schedules) without any safeguard hit
+PRIORITY_HIGH_SCORE = 8.0               # class thresholds for time-to-notify reporting
+PRIORITY_NORMAL_SCORE = 4.0
 
 # --- Scraper Settings ---
 USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
 SCRAPER_TIMEOUT = 20
-SCRAPER_RETRY_DELAY_MIN = 2.0
-SCRAPER_RETRY_DELAY_MAX = 4.0
+
+# Adaptive per-host rate limiting (requests/second, override per agency with "rate_limit")
+# Starts at ~1 request every 2s and adapts: +step on fast responses, x factor on 429/5xx/timeouts
+RATE_LIMIT_DEFAULT_RPS = 0.5
+RATE_LIMIT_MIN_RPS = 0.2
+RATE_LIMIT_MAX_RPS = 2.0
+RATE_LIMIT_BURST = 1
+RATE_LIMIT_INCREASE_STEP = 0.1
+RATE_LIMIT_DECREASE_FACTOR = 0.5
+RATE_LIMIT_SLOW_LATENCY = 2.0  # seconds; slower responses do not raise the rate
+
+# Keep-alive connection pool size per host (override per agency with "pool_size" in agencies.json,
+# which also raises that host's in-flight cap)
+HTTP_POOL_MAXSIZE = 2
+# Politeness cap: concurrent in-flight requests against a single host (a larger "pool_size" raises it)
+HTTP_MAX_INFLIGHT_PER_HOST = 2
+
+# Speculative list pagination: page N+1 is requested while page N is parsed
+# (still paced by the per-host rate limiter) and cancelled once pagination stops
+LIST_PREFETCH_ENABLED = True
+LIST_PREFETCH_WORKERS = 4
+
+# Article body fetching (backfills, fill_missing_content): bounded pool with per-host caps
+# and a retry budget per URL for timeouts / connection errors / 429 / 5xx
+CONTENT_FETCH_WORKERS = 8
+CONTENT_FETCH_PER_HOST = 2
+CONTENT_FETCH_RETRIES = 2
+CONTENT_FETCH_RETRY_BACKOFF = 2.0  # seconds, doubled per attempt
+
+# Concurrent detail-page lookups for sanction PDF links (cached in STATE_DIR/sanction_pdfs.json)
+SANCTION_PDF_WORKERS = 4
+
+# --- Collection Engine ---
+# Agencies collected in parallel (per-host limits above still apply)
+COLLECTION_MAX_WORKERS = 6
 
 # SSL Verification (False is recommended for some KR govt sites)
 SSL_VERIFY = False
 SUPPRESS_SSL_WARNINGS = True
 
+# --- Collector State ---
+# Persistent state between cycles (feed validators, caches). Relative to the working directory.
+STATE_DIR = "state"
+# Recent links remembered per scraper agency; known rows are skipped and list pagination
+# stops once this many consecutive dated rows are known (pinned notices never stop it alone)
+SEEN_LINKS_PER_AGENCY = 100
+KNOWN_LINK_STOP_ROWS = 3
+
+# --- Database ---
+# Links per `in_` query when checking a cycle's candidates for duplicates
+DEDUP_CHUNK_SIZE = 50
+# Near-duplicate releases (same press release via several sources): MinHash + LSH over the normalized title
+NEAR_DUP_ENABLED = True
+NEAR_DUP_CATEGORIES = ["press_release"]  # templated categories (sanctions, notices) would false-match
+NEAR_DUP_THRESHOLD = 0.8                # estimated Jaccard similarity to treat as the same release
+NEAR_DUP_LOOKBACK_DAYS = 3              # stored articles loaded into the index each cycle
+NEAR_DUP_MAX_RECENT = 2000
+NEAR_DUP_NUM_PERM = 64
+NEAR_DUP_BANDS = 16
+NEAR_DUP_SHINGLE_SIZE = 3
+NEAR_DUP_MIN_CHARS = 8                  # normalized title length below which items are never matched
+# Buffered article writes: flush after this many rows or once the oldest row waited this long
+DB_WRITE_BATCH_SIZE = 20
+DB_FLUSH_INTERVAL_SECONDS = 30
+
 # --- Scheduler Settings ---
 COLLECTION_INTERVAL_MINUTES = 10
 
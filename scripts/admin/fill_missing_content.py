@@ -0,0 +1,97 @@
+"""
+Fill article bodies that the pipeline skipped.
+The pipeline only downloads bodies for articles that reach Tier 2 analysis,
+so SKIPPED articles are stored with empty content. This job fetches them later
+for storage. It ONLY updates the content field.
+"""
+
+import os
+import sys
+import json
+from datetime import datetime, timedelta, timezone
+from dotenv import load_dotenv
+
+# Path setup
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(project_root)
+
+# Load env
+load_dotenv(os.path.join(project_root, 'web', '.env.local'))
+load_dotenv(os.path.join(project_root, '.env'))
+
+from supabase import create_client
+from src.collectors.scraper import ContentScraper
+from src.collectors.content_pool import ContentFetchPool
+from src.utils.logger import setup_logger
+
+logger = setup_logger("FillContent")
+
+def fill_missing_content(days=7, agency_filter=None, limit=200, dry_run=False):
+    """
+    Fetch and store bodies for recent articles with empty content.
+
+    Args:
+        days: Only look at articles published within this many days
+        agency_filter: Optional agency code to filter (e.g., 'FSS')
+        limit: Max articles per run
+        dry_run: If True, only print what would be done without actually updating
+    """
+    url = os.environ.get("NEXT_PUBLIC_SUPABASE_URL_V2") or os.environ.get("SUPABASE_URL")
+    key = os.environ.get("NEXT_PUBLIC_SUPABASE_ANON_KEY_V2") or os.environ.get("SUPABASE_ANON_KEY")
+
+    if not url or not key:
+        logger.error("Missing Supabase credentials")
+        return
+
+    supabase = create_client(url, key)
+
+    with open(os.path.join(project_root, 'config', 'agencies.json'), 'r', encoding='utf-8') as f:
+        agency_map = {a.get('code') or a.get('id'): a for a in json.load(f)['agencies']}
+
+    scraper = ContentScraper()
+    scraper.fetcher.configure_agencies(agency_map.values())
+
+    since = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+    query = supabase.table('articles').select('id, title, link, agency').eq('content', '').gte('published_at', since)
+    if agency_filter:
+        query = query.eq('agency', agency_filter)
+        logger.info(f"Filtering by agency: {agency_filter}")
+
+    articles = query.order('published_at', desc=True).limit(limit).execute().data or []
+    # Only agencies with a content selector can be scraped
+    articles = [a for a in articles if (agency_map.get(a['agency']) or {}).get('selector')]
+    logger.info(f"Found {len(articles)} articles with empty content.")
+
+    if dry_run:
+        logger.info("=== DRY RUN MODE - No changes will be made ===")
+        for article in articles:
+            logger.info(f"  Would fetch: [{article['agency']}] {article['title'][:50]}...")
+        return
+
+    filled = 0
+    pool = ContentFetchPool(scraper)
+    jobs = [(article, article['link'], agency_map[article['agency']]) for article in articles]
+    for i, (article, content) in enumerate(pool.fetch_all(jobs)):
+        logger.info(f"[{i+1}/{len(articles)}] Fetched: {article['title'][:40]}...")
+        if not content:
+            continue
+        try:
+            supabase.table('articles').update({'content': content}).eq('id', article['id']).execute()
+            filled += 1
+        except Exception as e:
+            logger.error(f"  -> Failed: {e}")
+
+    logger.info(f"Completed. Filled {filled}/{len(articles)} articles. {dict(pool.stats)}")
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Fetch bodies for articles stored without content')
+    parser.add_argument('--days', type=int, default=7, help='Look back this many days (default: 7)')
+    parser.add_argument('--agency', type=str, help='Filter by agency code (e.g., FSS)')
+    parser.add_argument('--limit', type=int, default=200, help='Max articles per run (default: 200)')
+    parser.add_argument('--dry-run', action='store_true', help='Print what would be done without executing')
+
+    args = parser.parse_args()
+
+    fill_missing_content(days=args.days, agency_filter=args.agency, limit=args.limit, dry_run=args.dry_run)
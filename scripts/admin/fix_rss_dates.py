@@ -43,7 +43,7 @@ def fix_rss_dates():
         logger.info(f"Fetching correct data for {agency['code']}...")
         try:
             # Fetch using the ROBUST parser
-            items = fetch_rss_feed(agency)
+            items = fetch_rss_feed(agency, conditional=False)
             logger.info(f"  > Got {len(items)} items from RSS.")
             
             updated_count = 0
@@ -23,13 +23,14 @@ from src.utils.logger import setup_logger
 
 logger = setup_logger("ReanalyzeNull")
 
-def reanalyze_null_articles(agency_filter=None, dry_run=False):
+def reanalyze_null_articles(agency_filter=None, dry_run=False, use_cache=True):
     """
     Find and reanalyze articles with NULL analysis_result.
     
     Args:
         agency_filter: Optional agency code to filter (e.g., 'MOEF')
         dry_run: If True, only print what would be done without actually updating
+        use_cache: If False, bypass the LLM response cache (force fresh scoring)
     """
     # Init DB
     url = os.environ.get("NEXT_PUBLIC_SUPABASE_URL_V2") or os.environ.get("SUPABASE_URL")
@@ -43,7 +44,7 @@ def reanalyze_null_articles(agency_filter=None, dry_run=False):
     
     # Init Analyzer (uses existing production logic)
     try:
-        analyzer = HybridAnalyzer()
+        analyzer = HybridAnalyzer(use_cache=use_cache)
         logger.info("Analyzer initialized successfully.")
     except Exception as e:
         logger.error(f"Failed to init Analyzer: {e}")
@@ -105,7 +106,8 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Reanalyze articles with NULL analysis_result')
     parser.add_argument('--agency', type=str, help='Filter by agency code (e.g., MOEF)')
     parser.add_argument('--dry-run', action='store_true', help='Print what would be done without executing')
+    parser.add_argument('--no-cache', action='store_true', help='Bypass the LLM response cache (force fresh scoring)')
     
     args = parser.parse_args()
     
-    reanalyze_null_articles(agency_filter=args.agency, dry_run=args.dry_run)
+    reanalyze_null_articles(agency_filter=args.agency, dry_run=args.dry_run, use_cache=not args.no_cache)
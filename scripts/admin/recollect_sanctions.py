@@ -21,6 +21,7 @@ for code in sanction_codes:
         
         for item in items:
             pipeline._process_single_item(item)
+        pipeline.flush_writes()
         print(f'  Saved to DB')
 
 print('Done!')
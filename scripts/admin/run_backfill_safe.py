@@ -1,7 +1,6 @@
 import sys
 import os
 import logging
-import re
 import time
 import random
 from datetime import datetime, timedelta
@@ -12,7 +11,10 @@ project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(_
 sys.path.append(project_root)
 
 from src.pipeline import Pipeline
+from src.db.writer import ArticleWriter
 from src.collectors.scraper import ContentScraper
+from src.collectors.content_pool import ContentFetchPool
+from src.collectors.html_parsing import parse_html
 from src.utils.logger import setup_logger
 from config import settings
 
@@ -29,8 +31,8 @@ class BackfillScraper(ContentScraper):
         Modified fetch_list_items for Deep Backfill (ignores 7-day safeguard)
         """
         base_url = agency_config.get('base_url') or agency_config.get('url')
-        selectors = agency_config.get('selector', {})
-        list_selector = selectors.get('list')
+        plan = self._plan(agency_config)
+        list_selector = plan.list_selector if plan else None
         
         if not base_url or not list_selector:
             logger.error(f"[{agency_config.get('code')}] Missing URL or list selector.")
@@ -47,103 +49,69 @@ class BackfillScraper(ContentScraper):
         all_items = []
         page = 1
         max_pages = 50 # Increased for backfill
+        pages = self.paginate(agency_config.get('code'), lambda n: self.page_url(base_url, n), max_pages, verify=False)
 
-        while page <= max_pages:
-            # URL Construction
-            if "fsc.go.kr" in base_url:
-                page_param = f"curPage={page}"
-                sep = "&" if "?" in base_url else "?"
-                if "curPage=" in base_url:
-                    current_url = re.sub(r'curPage=\d+', page_param, base_url)
-                else:
-                    current_url = f"{base_url}{sep}{page_param}"
-            else:
-                page_param = f"pageIndex={page}"
-                sep = "&" if "?" in base_url else "?"
-                if "pageIndex=" in base_url:
-                    current_url = re.sub(r'pageIndex=\d+', page_param, base_url)
-                else:
-                    current_url = f"{base_url}{sep}{page_param}"
-
-            logger.info(f"  [{agency_config.get('code')}] Page {page} fetching... {current_url}")
+        with pages:
+            while page <= max_pages:
+                logger.info(f"  [{agency_config.get('code')}] Page {page} fetching... {self.page_url(base_url, page)}")
 
-            try:
-                time.sleep(random.uniform(1.0, 2.0)) # Polite delay
-                response = requests.get(current_url, headers=self.headers, timeout=settings.SCRAPER_TIMEOUT, verify=False)
-                response.raise_for_status()
+                try:
+                    response = pages.get(page)
+                    response.raise_for_status()
                 
-                soup = BeautifulSoup(response.content, 'html.parser')
-                rows = soup.select(list_selector)
+                    soup = parse_html(response, list_selector)
+                    rows = plan.rows(soup)
                 
-                if not rows:
-                    logger.info(f"  [{agency_config.get('code')}] Page {page} empty. Stopping.")
-                    break
+                    if not rows:
+                        logger.info(f"  [{agency_config.get('code')}] Page {page} empty. Stopping.")
+                        break
                 
-                page_items = []
-                reached_cutoff = False
-
-                for row in rows:
-                    try:
-                        title_sel = selectors.get('title')
-                        title_elem = row.select_one(title_sel) if title_sel else row.select_one('a')
-                        
-                        if not title_elem:
-                            continue
-                            
-                        title = title_elem.get_text(strip=True)
-                        link_href = title_elem.get('href')
-                        
-                        if link_href:
-                            if not link_href.startswith('http'):
-                                from urllib.parse import urljoin
-                                link = urljoin(base_url, link_href)
-                            else:
-                                link = link_href
-                        else:
-                            link = base_url
-
-                        date_sel = selectors.get('date')
-                        date_str = ""
-                        if date_sel:
-                            date_elem = row.select_one(date_sel)
-                            if date_elem:
-                                date_str = date_elem.get_text(strip=True)
-
-                        pub_date = self._parse_date(date_str)
+                    page_items = []
+                    reached_cutoff = False
+
+                    for row in rows:
+                        try:
+                            fields = plan.extract_row(row, base_url)
+                            if not fields:
+                                continue
+
+                            title = fields['title']
+                            link = fields['link']
+                            pub_date = self._parse_date(fields['date'])
                         
-                        if pub_date:
-                            if pub_date >= cutoff_date:
-                                page_items.append({
-                                    'title': title,
-                                    'link': link,
-                                    'published_at': pub_date.isoformat(),
-                                    'agency': agency_config.get('code'),
-                                    'category': agency_config.get('category', 'press_release')
-                                })
+                            if pub_date:
+                                if pub_date >= cutoff_date:
+                                    page_items.append({
+                                        'title': title,
+                                        'link': link,
+                                        'published_at': pub_date.isoformat(),
+                                        'agency': agency_config.get('code'),
+                                        'category': agency_config.get('category', 'press_release')
+                                    })
+                                else:
+                                    # Found an item older than cutoff
+                                    logger.info(f"    > Hit older item: {pub_date.strftime('%Y-%m-%d')}. Stopping.")
+                                    reached_cutoff = True
                             else:
-                                # Found an item older than cutoff
-                                logger.info(f"    > Hit older item: {pub_date.strftime('%Y-%m-%d')}. Stopping.")
-                                reached_cutoff = True
-                        else:
-                            # If no date, assume new (or skip?) - safeguard: assume today but don't break
-                           pass
+                                # If no date, assume new (or skip?) - safeguard: assume today but don't break
+                               pass
 
-                    except Exception as e:
-                        logger.error(f"Error parsing row: {e}")
-                        continue
+                        except Exception as e:
+                            logger.error(f"Error parsing row: {e}")
+                            continue
                 
-                if page_items:
-                    all_items.extend(page_items)
-                    logger.info(f"    > Found {len(page_items)} items on Page {page}.")
+                    if page_items:
+                        all_items.extend(page_items)
+                        logger.info(f"    > Found {len(page_items)} items on Page {page}.")
                 
-                if reached_cutoff:
-                    break
+                    if reached_cutoff:
+                        break
                 
-                page += 1
+                    page += 1
 
-            except Exception as e:
-                logger.error(f"[{agency_config.get('code')}] Error fetching page {page}: {e}")
-                break
+                except Exception as e:
+                    logger.error(f"[{agency_config.get('code')}] Error fetching page {page}: {e}")
+                    break
 
         return all_items
 
@@ -156,6 +124,8 @@ class BackfillPipeline(Pipeline):
         config_path = os.path.join(project_root, 'config', 'agencies.json')
         super().__init__(config_path)
         self.scraper = BackfillScraper(days=target_days)
+        self.content_pool = ContentFetchPool(self.scraper)
+        self.writer = ArticleWriter(self.supabase, batch_size=100)
         self.target_days = target_days
     
     def run(self):
@@ -195,18 +165,12 @@ class BackfillPipeline(Pipeline):
                     # Scraper Mode - Deep Backfill
                     collected = self.scraper.fetch_list_items(config)
                     
-                    # Detail Fetch
-                    details = []
+                    # Detail Fetch (bounded pool, per-host caps, results as they complete)
                     logger.info(f"  > Fetching details for {len(collected)} items...")
-                    for i, item in enumerate(collected):
-                       try:
-                           if i % 10 == 0: print(f"    ... {i}/{len(collected)}")
-                           content = self.scraper.fetch_content(item['link'], config)
-                           item['content'] = content if content else ""
-                           details.append(item)
-                       except Exception as e:
-                           logger.error(f"Failed to fetch content for {item['link']}: {e}")
-                    collected = details
+                    jobs = [(i, item['link'], config) for i, item in enumerate(collected)]
+                    for done, (i, content) in enumerate(self.content_pool.fetch_all(jobs)):
+                        if done % 10 == 0: print(f"    ... {done}/{len(collected)}")
+                        collected[i]['content'] = content if content else ""
                 
                 all_articles.extend(collected)
                 logger.info(f"  > {code}: Collected {len(collected)} items.")
@@ -215,63 +179,54 @@ class BackfillPipeline(Pipeline):
                 logger.error(f"Failed to process {code}: {e}")
         
         logger.info(f"Total Collected: {len(all_articles)} articles.")
+        self.scraper.prefetch_stats.log()
+        logger.info(f"Content fetch: {dict(self.content_pool.stats)}")
         
         # Save & Analyze
         if all_articles:
              logger.info("Saving raw articles to Supabase...")
-             new_count = 0
-             skip_count = 0
+             # Batched upserts with on_conflict='link' / ignore_duplicates:
+             # existing rows are left untouched (preserves their analysis_result)
+             new_articles = []
              for article in all_articles:
-                 try:
-                     link = article.get('link')
-                     
-                     # Check if article already exists (to avoid overwriting analysis_result)
-                     existing = self.supabase.table('articles').select('id').eq('link', link).execute()
-                     
-                     if existing.data:
-                         # Already exists - skip to preserve existing data
-                         skip_count += 1
-                         continue
-                     
-                     # New article - insert
-                     record = {
-                         'agency': article.get('agency'),
-                         'title': article.get('title'),
-                         'content': article.get('content') or '',
-                         'published_at': article.get('published_at'),
-                         'link': link,
-                         'category': article.get('category'),
-                     }
-                     self.supabase.table('articles').insert(record).execute()
-                     new_count += 1
-                 except Exception as e:
-                     logger.error(f"DB Save Error: {e}")
+                 record = {
+                     'agency': article.get('agency'),
+                     'title': article.get('title'),
+                     'content': article.get('content') or '',
+                     'published_at': article.get('published_at'),
+                     'link': article.get('link'),
+                     'category': article.get('category'),
+                 }
+                 new_articles.extend(self.writer.add(record, article))
+             new_articles.extend(self.writer.flush())
+             new_count = len(new_articles)
+             skip_count = self.writer.stats['existing']
+             if self.writer.failed:
+                 logger.error(f"DB Save Error: {len(self.writer.failed)} rows failed")
              
              logger.info(f"Save Complete. New: {new_count}, Skipped (existing): {skip_count}")
              
              logger.info("Raw Save Complete. Starting Analysis...")
              
-             # Re-read from DB to get IDs if needed or just use Analyzer
-             for i, article in enumerate(all_articles):
-                if i % 10 == 0: logger.info(f"Analyzing {i}/{len(all_articles)}...")
-                
-                # Check duplication/existing analysis
-                # Ideally we check if analyzed already? 
-                # For backfill we just run it.
-                
-                try:
-                    if self.analyzer:
-                        analysis = self.analyzer.process(
-                            {'title': article['title'], 'content': article['content']},
-                            article['agency'],
-                            category=article.get('category')
-                        )
-                        if analysis:
-                            self.supabase.table('articles').update({
-                                'analysis_result': analysis
-                            }).eq('link', article['link']).execute()
-                except Exception as e:
-                    logger.error(f"Analysis Failed for {article.get('title')}: {e}")
+             # Concurrent analysis under the shared RPM/TPM budget; results arrive as they finish
+             # For backfill we just run it (no check for existing analysis).
+             if self.analyzer:
+                 jobs = [{
+                     'ref': article,
+                     'article': {'title': article['title'], 'content': article['content']},
+                     'agency_name': article['agency'],
+                     'category': article.get('category'),
+                 } for article in all_articles]
+
+                 for i, (article, analysis) in enumerate(self.analyzer.process_many(jobs)):
+                     if i % 10 == 0: logger.info(f"Analyzing {i}/{len(all_articles)}...")
+                     try:
+                         if analysis:
+                             self.supabase.table('articles').update({
+                                 'analysis_result': analysis
+                             }).eq('link', article['link']).execute()
+                     except Exception as e:
+                         logger.error(f"Analysis Failed for {article.get('title')}: {e}")
 
         logger.info("Backfill Complete.")
 
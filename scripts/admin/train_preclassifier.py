@@ -0,0 +1,144 @@
+"""
+Train / evaluate the local pre-classifier that runs in front of the Tier-1 gatekeeper.
+
+    python scripts/admin/train_preclassifier.py export --out state/articles_snapshot.jsonl
+    python scripts/admin/train_preclassifier.py train --snapshot state/articles_snapshot.jsonl
+    python scripts/admin/train_preclassifier.py evaluate --snapshot state/articles_snapshot.jsonl --confidence 0.9
+
+Labels come from gatekeeper results already stored in analysis_result:
+1 = importance_score >= IMPORTANCE_THRESHOLD (article went to Tier 2), 0 otherwise.
+Rows decided by rules or by the pre-classifier itself are excluded.
+"""
+
+import os
+import sys
+import json
+import random
+from dotenv import load_dotenv
+
+# Path setup
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(project_root)
+
+# Load env
+load_dotenv(os.path.join(project_root, 'web', '.env.local'))
+load_dotenv(os.path.join(project_root, '.env'))
+
+from config import settings
+from src.services.preclassifier import PreClassifier, example_for
+from src.utils.logger import setup_logger
+
+logger = setup_logger("PreClassifier")
+
+PAGE_SIZE = 1000
+EXCLUDED_FILTER_STATUSES = {'RULE', 'LOCAL', 'ERROR'}
+
+
+def export_snapshot(out_path, limit=None):
+    """Dump title/agency/analysis_result of analyzed articles to JSONL."""
+    from supabase import create_client
+
+    url = os.environ.get("NEXT_PUBLIC_SUPABASE_URL_V2") or os.environ.get("SUPABASE_URL")
+    key = os.environ.get("NEXT_PUBLIC_SUPABASE_ANON_KEY_V2") or os.environ.get("SUPABASE_ANON_KEY")
+    if not url or not key:
+        logger.error("Missing Supabase credentials")
+        return
+
+    supabase = create_client(url, key)
+    os.makedirs(os.path.dirname(out_path) or '.', exist_ok=True)
+
+    exported = 0
+    with open(out_path, 'w', encoding='utf-8') as f:
+        while limit is None or exported < limit:
+            page = supabase.table('articles') \
+                .select('title, agency, analysis_result') \
+                .not_.is_('analysis_result', 'null') \
+                .order('published_at', desc=True) \
+                .range(exported, exported + PAGE_SIZE - 1) \
+                .execute().data or []
+            if not page:
+                break
+            for row in page:
+                f.write(json.dumps(row, ensure_ascii=False) + '\n')
+            exported += len(page)
+            logger.info(f"Exported {exported} rows...")
+
+    logger.info(f"Snapshot written to {out_path} ({exported} rows)")
+
+
+def load_examples(snapshot_path):
+    """(text, label) pairs built with example_for(), the same input the analyzer feeds the model at triage."""
+    with open(os.path.join(project_root, 'config', 'agencies.json'), 'r', encoding='utf-8') as f:
+        names = {(a.get('code') or a.get('id')): a.get('name', '') for a in json.load(f)['agencies']}
+
+    examples = []
+    with open(snapshot_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            row = json.loads(line)
+            result = row.get('analysis_result') or {}
+            if result.get('filter_status') in EXCLUDED_FILTER_STATUSES or 'importance_score' not in result:
+                continue
+            agency_name = names.get(row.get('agency'), row.get('agency') or '')
+            label = int((result.get('importance_score') or 0) >= settings.IMPORTANCE_THRESHOLD)
+            examples.append((example_for(agency_name, row.get('title', '')), label))
+    return examples
+
+
+def split(examples, holdout, seed=42):
+    examples = list(examples)
+    random.Random(seed).shuffle(examples)
+    cut = int(len(examples) * (1 - holdout))
+    return examples[:cut], examples[cut:]
+
+
+def train(snapshot_path, model_path, epochs, holdout, confidence):
+    examples = load_examples(snapshot_path)
+    if not examples:
+        logger.error(f"No labeled examples in {snapshot_path}")
+        return
+    train_set, test_set = split(examples, holdout)
+    logger.info(f"Training on {len(train_set)} examples ({sum(l for _, l in train_set)} positive), "
+                f"holding out {len(test_set)}")
+
+    model = PreClassifier.train(train_set, epochs=epochs)
+    if test_set:
+        logger.info(f"Holdout: {model.evaluate(test_set, confidence)}")
+
+    model.save(model_path)
+    logger.info(f"Model saved to {model_path} ({len(model.weights)} weights)")
+
+
+def evaluate(snapshot_path, model_path, holdout, confidence):
+    model = PreClassifier.load(model_path)
+    _, test_set = split(load_examples(snapshot_path), holdout)
+    logger.info(f"Evaluation at confidence {confidence}: {model.evaluate(test_set, confidence)}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Train / evaluate the local gatekeeper pre-classifier')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p_export = sub.add_parser('export', help='Export an articles snapshot from Supabase')
+    p_export.add_argument('--out', default=os.path.join(settings.STATE_DIR, 'articles_snapshot.jsonl'))
+    p_export.add_argument('--limit', type=int, help='Max rows to export')
+
+    for name in ('train', 'evaluate'):
+        p = sub.add_parser(name)
+        p.add_argument('--snapshot', default=os.path.join(settings.STATE_DIR, 'articles_snapshot.jsonl'))
+        p.add_argument('--model', default=settings.PRECLASSIFIER_MODEL_PATH)
+        p.add_argument('--holdout', type=float, default=0.2, help='Fraction held out for evaluation (default: 0.2)')
+        p.add_argument('--confidence', type=float, default=settings.PRECLASSIFIER_CONFIDENCE,
+                       help=f'Confidence threshold to report coverage at (default: {settings.PRECLASSIFIER_CONFIDENCE})')
+        if name == 'train':
+            p.add_argument('--epochs', type=int, default=10)
+
+    args = parser.parse_args()
+
+    if args.command == 'export':
+        export_snapshot(args.out, args.limit)
+    elif args.command == 'train':
+        train(args.snapshot, args.model, args.epochs, args.holdout, args.confidence)
+    else:
+        evaluate(args.snapshot, args.model, args.holdout, args.confidence)
@@ -0,0 +1,101 @@
+"""
+Benchmark: full html.parser parse vs. src/collectors/html_parsing.parse_html
+(lxml when installed, declared-charset decoding, SoupStrainer-restricted parsing).
+
+1) Save sample pages once (list page + first detail page per agency):
+   python scripts/debug/benchmark_parsers.py --save
+2) Benchmark the saved pages:
+   python scripts/debug/benchmark_parsers.py --iterations 20
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from urllib.parse import urljoin
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(project_root)
+
+from bs4 import BeautifulSoup
+from config import settings
+from src.collectors.html_parsing import PARSER, parse_html, strainer_for
+
+DEFAULT_AGENCIES = ['FSS', 'BOK', 'FSC_REG']
+DEFAULT_DIR = os.path.join(project_root, 'scripts', 'debug', 'pages')
+
+
+def load_agencies():
+    with open(os.path.join(project_root, 'config', 'agencies.json'), 'r', encoding='utf-8') as f:
+        return {a.get('code'): a for a in json.load(f)['agencies']}
+
+
+def save_pages(agencies, codes, out_dir):
+    from src.collectors.http_client import get_fetcher
+
+    fetcher = get_fetcher()
+    fetcher.configure_agencies(agencies.values())
+    headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+    os.makedirs(out_dir, exist_ok=True)
+
+    for code in codes:
+        agency = agencies[code]
+        selectors = agency.get('selector', {})
+        response = fetcher.get(agency['url'], headers=headers, timeout=settings.SCRAPER_TIMEOUT, verify=settings.SSL_VERIFY)
+        with open(os.path.join(out_dir, f'{code}_list.html'), 'wb') as f:
+            f.write(response.content)
+        print(f"[{code}] list page saved ({len(response.content):,} bytes)")
+
+        soup = BeautifulSoup(response.content, 'html.parser')
+        link = soup.select_one(f"{selectors['list']} {selectors.get('link') or 'a'}")
+        if link and link.get('href'):
+            detail = fetcher.get(urljoin(agency['url'], link['href']), headers=headers,
+                                 timeout=settings.SCRAPER_TIMEOUT, verify=settings.SSL_VERIFY)
+            with open(os.path.join(out_dir, f'{code}_detail.html'), 'wb') as f:
+                f.write(detail.content)
+            print(f"[{code}] detail page saved ({len(detail.content):,} bytes)")
+
+
+def timed(fn, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        result = fn()
+    return (time.perf_counter() - started) / iterations * 1000, result
+
+
+def benchmark(agencies, codes, in_dir, iterations):
+    print(f"Parser backend: {PARSER}, {iterations} iterations\n")
+    print(f"{'page':<20} {'selector':<22} {'baseline ms':>12} {'new ms':>8} {'speedup':>8}  matches")
+
+    for code in codes:
+        selectors = agencies[code].get('selector', {})
+        for kind, selector in (('list', selectors.get('list')), ('detail', selectors.get('content'))):
+            path = os.path.join(in_dir, f'{code}_{kind}.html')
+            if not selector or not os.path.exists(path):
+                continue
+            with open(path, 'rb') as f:
+                content = f.read()
+
+            base_ms, base_hits = timed(lambda: BeautifulSoup(content, 'html.parser').select(selector), iterations)
+            new_ms, new_hits = timed(lambda: parse_html(content, selector).select(selector), iterations)
+            same = [e.get_text(strip=True) for e in base_hits] == [e.get_text(strip=True) for e in new_hits]
+            restricted = '' if strainer_for(selector) else ' (full parse)'
+            print(f"{code + '_' + kind:<20} {selector[:22]:<22} {base_ms:>12.1f} {new_ms:>8.1f} "
+                  f"{base_ms / new_ms if new_ms else 0:>7.1f}x  {len(new_hits)} {'OK' if same else 'MISMATCH'}{restricted}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Compare html.parser full parses with the restricted parsing layer')
+    parser.add_argument('--save', action='store_true', help='Fetch and save sample pages instead of benchmarking')
+    parser.add_argument('--dir', default=DEFAULT_DIR, help=f'Directory with saved pages (default: {DEFAULT_DIR})')
+    parser.add_argument('--agency', action='append', help=f'Agency code (repeatable, default: {DEFAULT_AGENCIES})')
+    parser.add_argument('--iterations', type=int, default=10)
+    args = parser.parse_args()
+
+    agencies = load_agencies()
+    codes = args.agency or DEFAULT_AGENCIES
+    if args.save:
+        save_pages(agencies, codes, args.dir)
+    else:
+        benchmark(agencies, codes, args.dir, args.iterations)
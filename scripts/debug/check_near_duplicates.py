@@ -0,0 +1,45 @@
+"""
+Sanity check for near-duplicate matching (src/services/near_duplicates.py).
+
+Cross-source copies of one release must match (stored row vs. RSS item vs. scraped
+item, differing only in source tags and punctuation); weekly routine notices that
+differ only by their date range must not.
+
+    python scripts/debug/check_near_duplicates.py
+"""
+
+import os
+import sys
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(project_root)
+
+from src.services.near_duplicates import NearDuplicateIndex
+
+SAME_RELEASE = [
+    ("[보도자료] 「금융소비자보호법 시행령」 일부개정령안 입법예고", "금융소비자보호법 시행령 일부개정령안 입법예고"),
+    ("(보도참고) 2024년 상반기 가계부채 동향 및 관리방안", "2024년 상반기 가계부채 동향 및 관리방안"),
+]
+DIFFERENT_WEEKS = [
+    ("국고채 발행 계획(10.14~10.18)", "국고채 발행 계획(10.21~10.25)"),
+    ("주간 금융시장 동향 (10.7~10.11)", "주간 금융시장 동향 (10.14~10.18)"),
+]
+
+
+def check(pairs, expect_match):
+    ok = True
+    for stored, incoming in pairs:
+        index = NearDuplicateIndex()
+        index.add('stored', stored)
+        match = index.query(incoming, exclude='incoming')
+        matched = match is not None
+        similarity = f"{match[1]:.2f}" if match else '-'
+        status = 'OK' if matched == expect_match else 'FAIL'
+        ok = ok and matched == expect_match
+        print(f"[{status}] match={matched} sim={similarity} | {stored} | {incoming}")
+    return ok
+
+
+if __name__ == "__main__":
+    passed = check(SAME_RELEASE, expect_match=True) & check(DIFFERENT_WEEKS, expect_match=False)
+    sys.exit(0 if passed else 1)
@@ -18,7 +18,7 @@ def force_reanalyze_latest():
     logger.info(f"Re-analyzing: {article['title']} ({article['agency']})")
 
     # 2. Analyze with NEW Prompt
-    analyzer = HybridAnalyzer()
+    analyzer = HybridAnalyzer(use_cache=False)  # intentional re-scoring: bypass LLM cache
     
     # Force analyze call directly
     # Need to simulate 'agency_name' for prompt
@@ -0,0 +1,21 @@
+-- Migration: Add duplicate_of column for near-duplicate press releases
+-- Deploy order: run this BEFORE deploying the code that writes the column (see docs/SCHEMA.md, "Migrations").
+-- Purpose: The same release arriving through several sources (joint FSC/FSS releases,
+--          MOEF items mirrored on korea.kr) is analyzed once. Later copies reuse the
+--          original's analysis_result and point to it here (see Pipeline._split_near_duplicates).
+
+-- 1. Add column (link of the original article)
+ALTER TABLE articles
+ADD COLUMN IF NOT EXISTS duplicate_of TEXT;
+
+-- 2. Index for "copies of this article" lookups (partial: most rows are originals)
+CREATE INDEX IF NOT EXISTS idx_articles_duplicate_of
+ON articles(duplicate_of)
+WHERE duplicate_of IS NOT NULL;
+
+COMMENT ON COLUMN articles.duplicate_of IS 'Link of the original article this row is a near-duplicate of (NULL for originals)';
+
+-- 3. Verification
+-- SELECT a.agency, a.title, o.agency AS original_agency, o.title AS original_title
+-- FROM articles a JOIN articles o ON o.link = a.duplicate_of
+-- ORDER BY a.published_at DESC LIMIT 20;
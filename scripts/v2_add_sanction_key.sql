@@ -0,0 +1,29 @@
+-- Migration: Add canonical sanction_key column for FSS sanction deduplication
+-- Deploy order: run this BEFORE deploying the code that writes the column (see docs/SCHEMA.md, "Migrations").
+-- Purpose: Replace the per-item full scan in Pipeline._is_sanction_duplicate
+--          (which re-parsed every stored URL) with a single indexed lookup.
+-- Key format: '<agency>:<examMgmtNo>:<emOpenSeq>' (see build_sanction_key in src/collectors/scraper.py)
+
+-- 1. Add column
+ALTER TABLE articles
+ADD COLUMN IF NOT EXISTS sanction_key TEXT;
+
+-- 2. Backfill existing sanction rows from their stored links
+UPDATE articles
+SET sanction_key = agency
+    || ':' || substring(link from '[?&]examMgmtNo=([^&#]+)')
+    || ':' || substring(link from '[?&]emOpenSeq=([^&#]+)')
+WHERE agency IN ('FSS_SANCTION', 'FSS_MGMT_NOTICE')
+  AND sanction_key IS NULL
+  AND link ~ '[?&]examMgmtNo=[^&#]+'
+  AND link ~ '[?&]emOpenSeq=[^&#]+';
+
+-- 3. Index for dedup lookups (partial: only sanction rows carry a key)
+CREATE INDEX IF NOT EXISTS idx_articles_sanction_key
+ON articles(sanction_key)
+WHERE sanction_key IS NOT NULL;
+
+COMMENT ON COLUMN articles.sanction_key IS 'Canonical FSS sanction ID: agency:examMgmtNo:emOpenSeq (NULL for non-sanction rows)';
+
+-- 4. Verification: remaining duplicate keys (clean with scripts/admin/clean_sanction_duplicates.py)
+-- SELECT sanction_key, count(*) FROM articles WHERE sanction_key IS NOT NULL GROUP BY 1 HAVING count(*) > 1;
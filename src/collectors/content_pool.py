@@ -0,0 +1,147 @@
+"""
+Bounded worker pool for article body fetching.
+
+Detail pages are fetched by up to CONTENT_FETCH_WORKERS threads, with at most
+CONTENT_FETCH_PER_HOST of them on any one host, so a long FSS backlog never
+occupies every worker while BOK / FSC pages wait. The dispatcher only hands a
+worker a URL whose host has a free slot, results are yielded in completion
+order, and each URL has its own retry budget for transient failures
+(timeouts, connection errors, 429 / 5xx). Pacing stays with the shared
+HttpFetcher's per-host rate limiter.
+"""
+
+import logging
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+import requests
+
+from config import settings
+from src.collectors.http_client import host_of
+
+logger = logging.getLogger(__name__)
+
+
+def is_transient(error: Exception) -> bool:
+    """Timeouts, connection errors, 429 and 5xx are worth retrying; 404s and parse failures are not."""
+    if isinstance(error, (requests.Timeout, requests.ConnectionError)):
+        return True
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return False
+
+
+class _Job:
+    __slots__ = ('key', 'url', 'agency_config', 'attempts', 'ready_at')
+
+    def __init__(self, key: Any, url: str, agency_config: Dict):
+        self.key = key
+        self.url = url
+        self.agency_config = agency_config
+        self.attempts = 0
+        self.ready_at = 0.0
+
+
+class ContentFetchPool:
+    def __init__(self, scraper, max_workers: int = None, per_host: int = None, retries: int = None):
+        self.scraper = scraper
+        self.max_workers = max_workers or settings.CONTENT_FETCH_WORKERS
+        self.per_host = per_host or settings.CONTENT_FETCH_PER_HOST
+        self.retries = settings.CONTENT_FETCH_RETRIES if retries is None else retries
+        self.stats = Counter()
+        self._lock = threading.Lock()
+
+    def _count(self, key: str, n: int = 1):
+        with self._lock:
+            self.stats[key] += n
+
+    def _backoff(self, attempts: int) -> float:
+        return settings.CONTENT_FETCH_RETRY_BACKOFF * (2 ** (attempts - 1))
+
+    def _attempt(self, job: _Job) -> Optional[str]:
+        job.attempts += 1
+        return self.scraper.fetch_content(job.url, job.agency_config, raise_errors=True)
+
+    def _should_retry(self, job: _Job, error: Exception) -> bool:
+        if job.attempts > self.retries or not is_transient(error):
+            return False
+        self._count('retries')
+        logger.info(f"Retrying {job.url} ({job.attempts}/{self.retries}) after: {error}")
+        return True
+
+    def fetch(self, url: str, agency_config: Dict) -> Optional[str]:
+        """Fetches one body in the calling thread with the same per-URL retry budget."""
+        job = _Job(url, url, agency_config)
+        while True:
+            try:
+                content = self._attempt(job)
+            except Exception as e:
+                if self._should_retry(job, e):
+                    time.sleep(self._backoff(job.attempts))
+                    continue
+                logger.error(f"Error scraping content from {url}: {e}")
+                self._count('failed')
+                return None
+            self._count('fetched' if content else 'empty')
+            return content
+
+    def fetch_all(self, jobs: Iterable[Tuple[Any, str, Dict]]) -> Iterator[Tuple[Any, Optional[str]]]:
+        """
+        jobs: (key, url, agency_config) tuples. Yields (key, content) as each body
+        finishes; content is None once a URL failed permanently or ran out of retries.
+        """
+        pending: Dict[str, deque] = {}
+        for key, url, agency_config in jobs:
+            pending.setdefault(host_of(url), deque()).append(_Job(key, url, agency_config))
+
+        in_flight: Dict[Any, Tuple[str, _Job]] = {}
+        host_load = Counter()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='content') as executor:
+            while pending or in_flight:
+                # Hand out ready jobs round-robin over hosts with a free slot
+                now = time.monotonic()
+                next_ready = None
+                dispatched = True
+                while dispatched and len(in_flight) < self.max_workers:
+                    dispatched = False
+                    for host in list(pending):
+                        queue = pending[host]
+                        if host_load[host] >= self.per_host or len(in_flight) >= self.max_workers:
+                            continue
+                        if queue[0].ready_at > now:
+                            next_ready = min(next_ready or queue[0].ready_at, queue[0].ready_at)
+                            continue
+                        job = queue.popleft()
+                        if not queue:
+                            del pending[host]
+                        in_flight[executor.submit(self._attempt, job)] = (host, job)
+                        host_load[host] += 1
+                        dispatched = True
+
+                if not in_flight:
+                    time.sleep(max(0.0, (next_ready or now) - time.monotonic()))
+                    continue
+
+                timeout = max(0.0, next_ready - time.monotonic()) if next_ready else None
+                done, _ = wait(list(in_flight), timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    host, job = in_flight.pop(future)
+                    host_load[host] -= 1
+                    try:
+                        content = future.result()
+                    except Exception as e:
+                        if self._should_retry(job, e):
+                            job.ready_at = time.monotonic() + self._backoff(job.attempts)
+                            pending.setdefault(host, deque()).append(job)
+                            continue
+                        logger.error(f"Error scraping content from {job.url}: {e}")
+                        self._count('failed')
+                        yield job.key, None
+                        continue
+                    self._count('fetched' if content else 'empty')
+                    yield job.key, content
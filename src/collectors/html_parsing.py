@@ -0,0 +1,111 @@
+"""
+Shared HTML parsing for scrapers.
+
+- Uses lxml when it is installed (html.parser otherwise).
+- Decodes the body once with the declared charset (Content-Type header, then
+  <meta charset>) instead of letting BeautifulSoup sniff the raw bytes.
+- Builds only the subtree a selector can match: the first compound of the
+  selector ("table" in "table tbody tr", ".dbdata") becomes a SoupStrainer.
+"""
+
+import codecs
+import logging
+import re
+from functools import lru_cache
+from typing import Optional, Union
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+logger = logging.getLogger(__name__)
+
+try:
+    import lxml  # noqa: F401
+    PARSER = 'lxml'
+except ImportError:
+    PARSER = 'html.parser'
+
+HEADER_CHARSET = re.compile(r'charset=["\']?([\w.:-]+)', re.I)
+META_CHARSET = re.compile(rb'<meta[^>]+charset=["\']?([\w.:-]+)', re.I)
+# First compound of a selector: tag, #id, .class parts (attribute / pseudo parts are dropped)
+COMPOUND = re.compile(r'^(?P<tag>[a-zA-Z][\w-]*)?(?P<rest>(?:[.#][\w-]+|\[[^\]]*\])*)(?P<pseudo>:.*)?$')
+
+
+def _valid_codec(name: Optional[str]) -> Optional[str]:
+    if not name:
+        return None
+    try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return None
+
+
+def declared_charset(content: bytes, content_type: Optional[str] = None) -> str:
+    """Charset from the Content-Type header, else <meta charset>, else utf-8."""
+    if content_type:
+        match = HEADER_CHARSET.search(content_type)
+        charset = _valid_codec(match.group(1)) if match else None
+        if charset:
+            return charset
+    match = META_CHARSET.search(content[:4096])
+    charset = _valid_codec(match.group(1).decode('ascii', 'ignore')) if match else None
+    return charset or 'utf-8'
+
+
+def decode_html(response_or_bytes: Union[bytes, object]) -> str:
+    """Decodes a requests.Response (or raw bytes) once with its declared charset."""
+    if isinstance(response_or_bytes, (bytes, bytearray)):
+        content, content_type = bytes(response_or_bytes), None
+    else:
+        content = response_or_bytes.content
+        content_type = response_or_bytes.headers.get('Content-Type')
+    charset = declared_charset(content, content_type)
+    # Korean government sites often declare EUC-KR but emit CP949-only characters
+    if charset == 'euc_kr':
+        charset = 'cp949'
+    return content.decode(charset, errors='replace')
+
+
+def _has_class(name: str):
+    # While parsing, the class attribute is still the raw space-separated string
+    def match(value) -> bool:
+        if not value:
+            return False
+        values = value.split() if isinstance(value, str) else value
+        return name in values
+    return match
+
+
+@lru_cache(maxsize=128)
+def strainer_for(selector: Optional[str]) -> Optional[SoupStrainer]:
+    """
+    SoupStrainer keeping every element the selector's first compound can match, or None
+    when the selector cannot be restricted safely (selector lists, leading pseudo-classes).
+    """
+    if not selector or ',' in selector:
+        return None
+    first = re.split(r'\s*[\s>+~]\s*', selector.strip(), maxsplit=1)[0]
+    match = COMPOUND.match(first)
+    if not match or match.group('pseudo'):
+        return None
+
+    tag = match.group('tag')
+    attrs = {}
+    rest = re.sub(r'\[[^\]]*\]', '', match.group('rest') or '')
+    for part in re.findall(r'[.#][\w-]+', rest):
+        if part[0] == '#':
+            attrs['id'] = part[1:]
+        elif 'class' not in attrs:
+            # One class is enough to restrict; select() re-checks the full selector
+            attrs['class'] = _has_class(part[1:])
+    if not tag and not attrs:
+        return None
+    return SoupStrainer(tag, attrs=attrs) if tag else SoupStrainer(attrs=attrs)
+
+
+def parse_html(response_or_bytes: Union[bytes, str, object], selector: Optional[str] = None) -> BeautifulSoup:
+    """
+    Parses a page for `selector`: only the matching subtrees are built when the selector
+    allows it, so soup.select(selector) / select_one(selector) work as on the full document.
+    """
+    markup = response_or_bytes if isinstance(response_or_bytes, str) else decode_html(response_or_bytes)
+    return BeautifulSoup(markup, PARSER, parse_only=strainer_for(selector))
@@ -0,0 +1,178 @@
+"""
+Shared HTTP fetcher for collectors.
+
+Keeps one keep-alive requests.Session per host so that consecutive pages on
+fss.or.kr / bok.or.kr / fsc.go.kr reuse pooled connections instead of paying
+a new TCP + TLS handshake per request. Every request is paced by the adaptive
+per-host HostRateLimiter.
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import settings
+from src.collectors.rate_limiter import HostRateLimiter
+
+logger = logging.getLogger(__name__)
+
+
+def host_of(url: str) -> str:
+    """Returns the lower-cased host (netloc) of a URL."""
+    return urlparse(url).netloc.lower()
+
+
+class RequestCancelled(Exception):
+    """Raised by HttpFetcher.get when its cancel event is set before the request is sent."""
+
+
+class HttpFetcher:
+    """Per-host pooled HTTP client with connection-reuse counters."""
+
+    def __init__(self, headers: Optional[Dict[str, str]] = None):
+        self.headers = headers or {'User-Agent': settings.USER_AGENT}
+        self._sessions: Dict[str, requests.Session] = {}
+        self._pool_sizes: Dict[str, int] = {}
+        self._request_counts: Dict[str, int] = {}
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+        self.limiter = HostRateLimiter()
+
+    def configure_agency(self, agency_config: Dict):
+        """
+        Registers pool size and rate limits for every host an agency talks to.
+        Agencies sharing a host (e.g. FSS boards) get the largest configured pool
+        and the most conservative rate limit. A pool_size above
+        HTTP_MAX_INFLIGHT_PER_HOST also raises the host's in-flight cap to match.
+        """
+        pool_size = int(agency_config.get('pool_size') or settings.HTTP_POOL_MAXSIZE)
+        for key in ('url', 'base_url', 'rss_url'):
+            url = agency_config.get(key)
+            if not url:
+                continue
+            host = host_of(url)
+            self.limiter.configure_host(host, agency_config.get('rate_limit'))
+            with self._lock:
+                if pool_size > self._pool_sizes.get(host, 0):
+                    self._pool_sizes[host] = pool_size
+                    if host in self._sessions:
+                        self._mount(self._sessions[host], pool_size)
+                    # Recreated with the new size on the next request; in-flight holders release the old one
+                    self._host_slots.pop(host, None)
+
+    def configure_agencies(self, agencies: Iterable[Dict]):
+        for agency in agencies:
+            self.configure_agency(agency)
+
+    def _mount(self, session: requests.Session, pool_size: int):
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, pool_block=False)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+
+    def _session_for(self, host: str) -> requests.Session:
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                session.headers.update({'Connection': 'keep-alive'})
+                self._mount(session, self._pool_sizes.get(host, settings.HTTP_POOL_MAXSIZE))
+                self._sessions[host] = session
+            self._request_counts[host] = self._request_counts.get(host, 0) + 1
+            return session
+
+    def _slot_for(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = threading.BoundedSemaphore(
+                    max(settings.HTTP_MAX_INFLIGHT_PER_HOST, self._pool_sizes.get(host, 0)))
+                self._host_slots[host] = slot
+            return slot
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None,
+            cancelled: Optional[threading.Event] = None, **kwargs) -> requests.Response:
+        """
+        GET through the host's pooled session, paced by the host's rate limiter.
+        At most HTTP_MAX_INFLIGHT_PER_HOST requests (or the host's larger pool_size)
+        run against one host at a time, so concurrent agency collection
+        stays polite to shared hosts (e.g. fss.or.kr).
+        Setting `cancelled` while the request waits for its rate-limit token raises
+        RequestCancelled; a request already sent is not interrupted.
+        Extra kwargs (timeout, verify, ...) are passed to requests as-is.
+        """
+        kwargs.setdefault('timeout', settings.SCRAPER_TIMEOUT)
+        host = host_of(url)
+        if not self.limiter.acquire(host, cancelled):
+            raise RequestCancelled(url)
+        session = self._session_for(host)
+        with self._slot_for(host):
+            started = time.monotonic()
+            try:
+                response = session.get(url, headers=headers or self.headers, **kwargs)
+            except (requests.Timeout, requests.ConnectionError):
+                self.limiter.record(host, time.monotonic() - started, failed=True)
+                raise
+        self.limiter.record(host, time.monotonic() - started, status_code=response.status_code)
+        return response
+
+    def stats(self) -> Dict[str, Dict]:
+        """
+        Connection-reuse counters and current request rate per host.
+        'connections' is the number of sockets opened (each one a TCP/TLS handshake),
+        'reused' is how many requests were served on an already open connection.
+        """
+        result = {}
+        rates = self.limiter.rates()
+        with self._lock:
+            sessions = dict(self._sessions)
+            request_counts = dict(self._request_counts)
+
+        for host, session in sessions.items():
+            connections = 0
+            adapters = {id(a): a for a in session.adapters.values()}
+            for adapter in adapters.values():
+                pools = adapter.poolmanager.pools
+                for key in list(pools.keys()):
+                    pool = pools.get(key)
+                    if pool is not None:
+                        connections += getattr(pool, 'num_connections', 0)
+            requests_made = request_counts.get(host, 0)
+            result[host] = {
+                'requests': requests_made,
+                'connections': connections,
+                'reused': max(requests_made - connections, 0),
+                'pool_size': self._pool_sizes.get(host, settings.HTTP_POOL_MAXSIZE),
+                'rate': rates.get(host),
+            }
+        return result
+
+    def log_stats(self):
+        for host, s in self.stats().items():
+            logger.info(
+                f"[HTTP] {host}: {s['requests']} requests, {s['connections']} connections, "
+                f"{s['reused']} reused (pool={s['pool_size']}, rate={s['rate']} req/s)"
+            )
+
+    def close(self):
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+_shared_fetcher: Optional[HttpFetcher] = None
+_shared_lock = threading.Lock()
+
+
+def get_fetcher() -> HttpFetcher:
+    """Returns the process-wide fetcher shared by ContentScraper and rss_parser."""
+    global _shared_fetcher
+    with _shared_lock:
+        if _shared_fetcher is None:
+            _shared_fetcher = HttpFetcher()
+        return _shared_fetcher
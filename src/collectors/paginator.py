@@ -0,0 +1,133 @@
+"""
+Speculative prefetch for paginated list pages.
+
+While page N is parsed, page N+1 is already requested through the shared
+HttpFetcher (so it waits for the host's rate-limit token like any other request).
+When the caller stops paginating (cutoff date, known link, short page) the
+outstanding prefetch is cancelled: if it is still waiting for its token it is
+dropped without touching the host, otherwise its response is discarded.
+
+Per-agency counters:
+    prefetched - speculative requests scheduled
+    used       - prefetched pages the caller actually consumed
+    wasted     - prefetched pages fetched (or failed) but never consumed
+    cancelled  - prefetches dropped before the request was sent
+"""
+
+import logging
+import threading
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from config import settings
+from src.collectors.http_client import HttpFetcher, RequestCancelled
+
+logger = logging.getLogger(__name__)
+
+
+class PrefetchStats:
+    """Thread-safe prefetch counters per agency, accumulated across cycles."""
+
+    def __init__(self):
+        self._counters: Dict[str, Counter] = {}
+        self._lock = threading.Lock()
+
+    def count(self, agency_code: str, key: str):
+        with self._lock:
+            self._counters.setdefault(agency_code, Counter())[key] += 1
+
+    def report(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {code: dict(counter) for code, counter in self._counters.items()}
+
+    def log(self):
+        for code, c in self.report().items():
+            logger.info(f"[Prefetch] {code}: {c.get('used', 0)} used, {c.get('wasted', 0)} wasted, "
+                        f"{c.get('cancelled', 0)} cancelled of {c.get('prefetched', 0)} prefetched")
+
+
+class ListPaginator:
+    """
+    Fetches list pages in order, prefetching the next page in the background.
+
+        with ListPaginator(fetcher, executor, stats, code, url_for_page, max_pages, ...) as pages:
+            while page <= max_pages:
+                response = pages.get(page)
+                ...  # parse; break out to stop (the pending prefetch is cancelled on exit)
+
+    prefetch_from: first page after which prefetching starts. Incremental scans that
+    usually stop on page 1 (known links) pass 2 so a quiet agency still costs one request.
+    """
+
+    def __init__(self, fetcher: HttpFetcher, executor: Optional[ThreadPoolExecutor], stats: PrefetchStats,
+                 agency_code: str, url_for_page: Callable[[int], str], max_pages: int,
+                 prefetch_from: int = 1, **request_kwargs):
+        self.fetcher = fetcher
+        self.executor = executor
+        self.stats = stats
+        self.agency_code = agency_code
+        self.url_for_page = url_for_page
+        self.max_pages = max_pages
+        self.prefetch_from = prefetch_from
+        self.request_kwargs = request_kwargs
+
+        self._pending_page: Optional[int] = None
+        self._pending: Optional[Future] = None
+        self._cancel: Optional[threading.Event] = None
+
+    def __enter__(self) -> 'ListPaginator':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _fetch(self, url: str, cancelled: Optional[threading.Event] = None):
+        return self.fetcher.get(url, cancelled=cancelled, **self.request_kwargs)
+
+    def _schedule(self, page: int):
+        if self.executor is None or page > self.max_pages or page - 1 < self.prefetch_from:
+            return
+        self._cancel = threading.Event()
+        self._pending_page = page
+        self._pending = self.executor.submit(self._fetch, self.url_for_page(page), self._cancel)
+        self.stats.count(self.agency_code, 'prefetched')
+
+    def get(self, page: int):
+        """
+        Returns the response for `page` (the prefetched one when available) and
+        schedules page + 1. Fetch errors are raised as for a direct request.
+        """
+        if self._pending is not None and self._pending_page == page:
+            future, self._pending, self._pending_page = self._pending, None, None
+            self.stats.count(self.agency_code, 'used')
+            response = future.result()
+        else:
+            self.close()
+            response = self._fetch(self.url_for_page(page))
+
+        if response.ok:
+            self._schedule(page + 1)
+        return response
+
+    def close(self):
+        """Cancels the outstanding prefetch, if any."""
+        if self._pending is None:
+            return
+        future, self._pending, self._pending_page = self._pending, None, None
+        self._cancel.set()
+        if future.cancel():
+            self.stats.count(self.agency_code, 'cancelled')
+            return
+        future.add_done_callback(self._count_discarded)
+
+    def _count_discarded(self, future: Future):
+        cancelled = isinstance(future.exception(), RequestCancelled)
+        self.stats.count(self.agency_code, 'cancelled' if cancelled else 'wasted')
+
+
+def prefetch_executor() -> Optional[ThreadPoolExecutor]:
+    """Shared background pool for page prefetches (None when LIST_PREFETCH_ENABLED is off)."""
+    if not settings.LIST_PREFETCH_ENABLED:
+        return None
+    return ThreadPoolExecutor(max_workers=settings.LIST_PREFETCH_WORKERS, thread_name_prefix='prefetch')
@@ -0,0 +1,113 @@
+"""
+Adaptive per-host rate limiter.
+
+Token bucket keyed by host with AIMD (additive increase / multiplicative decrease)
+rate control: the request rate creeps up while a host answers quickly and is cut
+back sharply on 429, 5xx or timeouts. Replaces the fixed random sleeps that used
+to precede every scraper request.
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class _Bucket:
+    def __init__(self, rate: float, min_rate: float, max_rate: float, burst: float):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+class HostRateLimiter:
+    """Token-bucket limiter per host with AIMD rate adjustment (rates in requests/second)."""
+
+    def __init__(self):
+        self._buckets: Dict[str, _Bucket] = {}
+        self._lock = threading.Lock()
+
+    def configure_host(self, host: str, rate_config: Optional[Dict] = None):
+        """
+        Sets rate limits for a host from an agency's "rate_limit" block:
+        {"rate": 0.5, "min_rate": 0.2, "max_rate": 2.0, "burst": 1}
+        Agencies sharing a host keep the most conservative (lowest) values.
+        """
+        rate_config = rate_config or {}
+        rate = float(rate_config.get('rate', settings.RATE_LIMIT_DEFAULT_RPS))
+        min_rate = float(rate_config.get('min_rate', settings.RATE_LIMIT_MIN_RPS))
+        max_rate = float(rate_config.get('max_rate', settings.RATE_LIMIT_MAX_RPS))
+        burst = float(rate_config.get('burst', settings.RATE_LIMIT_BURST))
+
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                self._buckets[host] = _Bucket(rate, min_rate, max_rate, burst)
+            else:
+                bucket.rate = min(bucket.rate, rate)
+                bucket.min_rate = min(bucket.min_rate, min_rate)
+                bucket.max_rate = min(bucket.max_rate, max_rate)
+                bucket.burst = min(bucket.burst, burst)
+
+    def _bucket_for(self, host: str) -> _Bucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = _Bucket(settings.RATE_LIMIT_DEFAULT_RPS, settings.RATE_LIMIT_MIN_RPS,
+                             settings.RATE_LIMIT_MAX_RPS, settings.RATE_LIMIT_BURST)
+            self._buckets[host] = bucket
+        return bucket
+
+    def acquire(self, host: str, cancelled: Optional[threading.Event] = None) -> bool:
+        """
+        Blocks until a request token for the host is available.
+        Returns False without taking a token if `cancelled` is set while waiting.
+        """
+        while True:
+            if cancelled is not None and cancelled.is_set():
+                return False
+            with self._lock:
+                bucket = self._bucket_for(host)
+                now = time.monotonic()
+                bucket.refill(now)
+                if bucket.tokens >= 1:
+                    bucket.tokens -= 1
+                    return True
+                wait = (1 - bucket.tokens) / bucket.rate
+            if cancelled is not None:
+                cancelled.wait(wait)
+            else:
+                time.sleep(wait)
+
+    def record(self, host: str, latency: float, status_code: Optional[int] = None, failed: bool = False):
+        """
+        Feeds a request outcome back into the host's rate.
+        429 / 5xx / timeouts (failed=True) halve the rate, fast successes add a step.
+        Slow successes leave the rate unchanged.
+        """
+        with self._lock:
+            bucket = self._bucket_for(host)
+            previous = bucket.rate
+            if failed or status_code == 429 or (status_code is not None and status_code >= 500):
+                bucket.rate = max(bucket.min_rate, bucket.rate * settings.RATE_LIMIT_DECREASE_FACTOR)
+            elif latency < settings.RATE_LIMIT_SLOW_LATENCY:
+                bucket.rate = min(bucket.max_rate, bucket.rate + settings.RATE_LIMIT_INCREASE_STEP)
+
+            if bucket.rate < previous:
+                logger.warning(f"[RateLimit] {host} backing off: {previous:.2f} -> {bucket.rate:.2f} req/s "
+                               f"(status={status_code}, failed={failed})")
+
+    def rates(self) -> Dict[str, float]:
+        """Current request rate (req/s) per host, for monitoring."""
+        with self._lock:
+            return {host: round(bucket.rate, 3) for host, bucket in self._buckets.items()}
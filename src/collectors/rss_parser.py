@@ -1,6 +1,10 @@
 import feedparser
+import hashlib
+import html
 import json
 import os
+import re
+import threading
 from datetime import datetime, timezone, timedelta
 from email.utils import parsedate_to_datetime
 from typing import List, Dict, Optional
@@ -26,9 +30,50 @@ def parse_date(date_str: str) -> Optional[datetime]:
     except Exception:
         return None
 
-def fetch_rss_feed(agency: Dict) -> List[Dict]:
+_feed_state = None
+
+def _get_feed_state():
+    # Per-feed validators (ETag / Last-Modified / body hash), persisted between cycles
+    global _feed_state
+    if _feed_state is None:
+        from src.utils.state_store import JsonStateStore
+        _feed_state = JsonStateStore('rss_validators')
+    return _feed_state
+
+# Validators of feeds parsed this cycle, by agency code. They are only stored once the
+# pipeline has handled the feed's items, so a failed cycle refetches the feed in full.
+_pending_validators = {}
+_pending_lock = threading.Lock()
+
+def commit_feed_validators(skip_agencies=()):
+    """Stores the validators fetched this cycle, except for agencies whose items were not all saved."""
+    with _pending_lock:
+        pending = dict(_pending_validators)
+        _pending_validators.clear()
+    for agency_id, (url, validators) in pending.items():
+        if agency_id not in skip_agencies:
+            _get_feed_state().set(url, validators)
+
+def discard_feed_validators():
+    """Drops validators left pending by a cycle that never reached commit_feed_validators()."""
+    with _pending_lock:
+        _pending_validators.clear()
+
+def clean_summary(raw: str) -> str:
+    """Strips tags / entities from an RSS summary so it can stand in for the article body in Tier 1."""
+    if not raw:
+        return ''
+    text = html.unescape(re.sub(r'<[^>]+>', ' ', raw))
+    return re.sub(r'\s+', ' ', text).strip()
+
+def fetch_rss_feed(agency: Dict, conditional: bool = True) -> List[Dict]:
     """
     Fetches and parses RSS feed for a single agency.
+
+    With conditional=True the stored ETag / Last-Modified validators are sent as
+    If-None-Match / If-Modified-Since. A 304, or an unchanged body hash (covers
+    servers that send no validators), returns [] without running feedparser.
+    New validators stay pending until commit_feed_validators() runs at the end of the cycle.
     """
     # 1. Check Method
     if agency.get('collection_method') and agency.get('collection_method') != 'rss':
@@ -48,11 +93,36 @@ def fetch_rss_feed(agency: Dict) -> List[Dict]:
         'User-Agent': settings.USER_AGENT
     }
 
+    state = _get_feed_state() if conditional else None
+    validators = (state.get(target_url) or {}) if state else {}
+    if validators.get('etag'):
+        headers['If-None-Match'] = validators['etag']
+    if validators.get('last_modified'):
+        headers['If-Modified-Since'] = validators['last_modified']
+
     try:
-        import requests
-        response = requests.get(target_url, headers=headers, timeout=settings.SCRAPER_TIMEOUT)
+        from src.collectors.http_client import get_fetcher
+        response = get_fetcher().get(target_url, headers=headers, timeout=settings.SCRAPER_TIMEOUT)
+
+        if response.status_code == 304:
+            print("  > Not modified (304). Skipping parse.")
+            return []
         response.raise_for_status()
-        
+
+        body_hash = hashlib.sha256(response.content).hexdigest()
+        if state:
+            new_validators = {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'body_hash': body_hash
+            }
+            if body_hash == validators.get('body_hash'):
+                state.set(target_url, new_validators)
+                print("  > Feed body unchanged (hash match). Skipping parse.")
+                return []
+            with _pending_lock:
+                _pending_validators[agency.get('code') or agency.get('id')] = (target_url, new_validators)
+
         # Parse XML content
         feed = feedparser.parse(response.content)
         
@@ -93,6 +163,7 @@ def fetch_rss_feed(agency: Dict) -> List[Dict]:
             'agency': agency_id,
             'title': title,
             'link': link,
+            'description': clean_summary(entry.get('summary') or entry.get('description', '')),
             'published_at': published_at.isoformat() if published_at else datetime.now(KST).isoformat(), 
             'source_published_at_str': published
         }
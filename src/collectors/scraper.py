@@ -1,14 +1,17 @@
-import requests
-from bs4 import BeautifulSoup
-import time
-import random
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
 from config import settings
+from src.collectors.http_client import get_fetcher
+from src.collectors.html_parsing import parse_html
+from src.collectors.paginator import ListPaginator, PrefetchStats, prefetch_executor
+from src.collectors.selector_plan import ExtractionPlan, SanctionRowPlan, compile_plans
+from src.utils.state_store import JsonStateStore
 
 import urllib3
+from requests import RequestException
 
 # Suppress InsecureRequestWarning for verify=False
 if settings.SUPPRESS_SSL_WARNINGS:
@@ -16,6 +19,20 @@ if settings.SUPPRESS_SSL_WARNINGS:
 
 logger = logging.getLogger(__name__)
 
+def build_sanction_key(agency_code: str, link: str) -> Optional[str]:
+    """
+    Canonical dedup key for FSS sanction notices: "<agency>:<examMgmtNo>:<emOpenSeq>".
+    The list URLs carry varying date params, so the link itself is not stable.
+    Returns None when the link has no sanction IDs (e.g. direct PDF links).
+    """
+    from urllib.parse import urlparse, parse_qs
+    params = parse_qs(urlparse(link).query)
+    exam_id = params.get('examMgmtNo', [None])[0]
+    seq = params.get('emOpenSeq', [None])[0]
+    if exam_id and seq:
+        return f"{agency_code}:{exam_id}:{seq}"
+    return None
+
 class ContentScraper:
     def __init__(self):
         # Use a very standard Chrome User-Agent
@@ -25,18 +42,81 @@ class ContentScraper:
             'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
             'Connection': 'keep-alive'
         }
+        # Pooled keep-alive sessions shared with the RSS collector (paced per host by its rate limiter)
+        self.fetcher = get_fetcher()
+        # Most recent links seen per agency (incremental discovery)
+        self.seen_links = JsonStateStore('seen_links')
+        # Resolved sanction PDF links by sanction key (agency + examMgmtNo + emOpenSeq); detail pages are fetched once
+        self.sanction_pdfs = JsonStateStore('sanction_pdfs')
+        # Compiled selector plans per agency code (see compile_plans)
+        self.plans: Dict[str, ExtractionPlan] = {}
+        self.sanction_plan = SanctionRowPlan()
+        # Background prefetch of the next list page (see paginator.ListPaginator)
+        self.prefetch_pool = prefetch_executor()
+        self.prefetch_stats = PrefetchStats()
+
+    def compile_plans(self, agencies):
+        """Compiles all agency selectors up front; invalid selectors raise SelectorConfigError."""
+        self.plans.update(compile_plans(agencies))
+
+    def _plan(self, agency_config: Dict) -> Optional[ExtractionPlan]:
+        code = agency_config.get('code') or agency_config.get('id')
+        plan = self.plans.get(code)
+        if plan is None:
+            selectors = agency_config.get('selector') or agency_config.get('scraper')
+            if not selectors:
+                return None
+            plan = self.plans[code] = ExtractionPlan(code, selectors)
+        return plan
+
+    def paginate(self, agency_code: str, url_for_page, max_pages: int, prefetch_from: int = 1,
+                 verify=settings.SSL_VERIFY) -> ListPaginator:
+        return ListPaginator(self.fetcher, self.prefetch_pool, self.prefetch_stats, agency_code,
+                             url_for_page, max_pages, prefetch_from=prefetch_from,
+                             headers=self.headers, timeout=settings.SCRAPER_TIMEOUT, verify=verify)
+
+    @staticmethod
+    def page_url(base_url: str, page: int) -> str:
+        """List URL for a page number (FSC boards use curPage, the others pageIndex)."""
+        name = "curPage" if "fsc.go.kr" in base_url else "pageIndex"
+        page_param = f"{name}={page}"
+        if f"{name}=" in base_url:
+            return re.sub(rf'{name}=\d+', page_param, base_url)
+        sep = "&" if "?" in base_url else "?"
+        return f"{base_url}{sep}{page_param}"
+
+    def known_links(self, agency_code: str) -> set:
+        return set(self.seen_links.get(agency_code) or [])
+
+    def remember_links(self, agency_code: str, links: List[str]):
+        """
+        Records links as known for an agency, newest first, keeping the last
+        SEEN_LINKS_PER_AGENCY entries.
+        """
+        if not links:
+            return
+        merged, seen = [], set()
+        for link in list(links) + (self.seen_links.get(agency_code) or []):
+            if link not in seen:
+                seen.add(link)
+                merged.append(link)
+        self.seen_links.set(agency_code, merged[:settings.SEEN_LINKS_PER_AGENCY])
 
     def fetch_list_items(self, agency_config: Dict, last_crawled_date: datetime = None) -> List[Dict]:
         """
         Fetches list of articles using HTML scraping with AUTOMATIC PAGINATION.
-        Loops through pages until it hits data older than cutoff_date.
+        Loops through pages until it hits data older than cutoff_date, or, once the
+        agency has known links, once KNOWN_LINK_STOP_ROWS consecutive dated rows are
+        already known (a quiet agency then costs a single page fetch). Known rows are
+        skipped, not treated as a stop on their own: a pinned notice at the top of the
+        list or a row without its own link must not hide the new rows below it.
         """
         if agency_config.get('collection_method') != 'scraper':
             return []
 
         base_url = agency_config.get('url')
-        selectors = agency_config.get('selector', {})
-        list_selector = selectors.get('list')
+        plan = self._plan(agency_config)
+        list_selector = plan.list_selector if plan else None
         
         if not base_url or not list_selector:
             logger.error(f"[{agency_config.get('code')}] Missing URL or list selector.")
@@ -60,152 +140,136 @@ class ContentScraper:
             cutoff_date = max_cutoff
             logger.info(f"[{agency_config.get('code')}] Full Scan (7d): > {cutoff_date.strftime('%Y-%m-%d')}")
 
+        known = self.known_links(agency_config.get('code'))
+        if known:
+            logger.info(f"[{agency_config.get('code')}] Incremental discovery: stopping after "
+                        f"{settings.KNOWN_LINK_STOP_ROWS} consecutive of {len(known)} known links")
+
         all_items = []
         page = 1
         max_pages = 15
+        consecutive_known = 0
+        # Page 2 is only prefetched when incremental discovery did not already stop on page 1
+        pages = self.paginate(agency_config.get('code'), lambda n: self.page_url(base_url, n), max_pages,
+                              prefetch_from=2 if known else 1)
 
-        while page <= max_pages:
-            if "fsc.go.kr" in base_url:
-                page_param = f"curPage={page}"
-                sep = "&" if "?" in base_url else "?"
-                if "curPage=" in base_url:
-                    current_url = re.sub(r'curPage=\d+', page_param, base_url)
-                else:
-                    current_url = f"{base_url}{sep}{page_param}"
-            else:
-                page_param = f"pageIndex={page}"
-                sep = "&" if "?" in base_url else "?"
-                if "pageIndex=" in base_url:
-                    current_url = re.sub(r'pageIndex=\d+', page_param, base_url)
-                else:
-                    current_url = f"{base_url}{sep}{page_param}"
-
-            logger.info(f"  [{agency_config.get('code')}] Page {page} fetching...")
-
-            try:
-                time.sleep(random.uniform(settings.SCRAPER_RETRY_DELAY_MIN, settings.SCRAPER_RETRY_DELAY_MAX))
-                response = requests.get(current_url, headers=self.headers, timeout=settings.SCRAPER_TIMEOUT, verify=settings.SSL_VERIFY)
-                response.raise_for_status()
+        with pages:
+            while page <= max_pages:
+                logger.info(f"  [{agency_config.get('code')}] Page {page} fetching...")
+
+                try:
+                    response = pages.get(page)
+                    response.raise_for_status()
                 
-                soup = BeautifulSoup(response.content, 'html.parser')
-                rows = soup.select(list_selector)
+                    soup = parse_html(response, list_selector)
+                    rows = plan.rows(soup)
                 
-                if not rows:
-                    if page == 1:
-                        logger.warning(f"[{agency_config.get('code')}] No items found on Page 1 (Selector: {list_selector})")
-                    else:
-                        logger.info(f"  [{agency_config.get('code')}] Page {page} empty. Stopping.")
-                    break
+                    if not rows:
+                        if page == 1:
+                            logger.warning(f"[{agency_config.get('code')}] No items found on Page 1 (Selector: {list_selector})")
+                        else:
+                            logger.info(f"  [{agency_config.get('code')}] Page {page} empty. Stopping.")
+                        break
                 
-                page_items = []
-                reached_cutoff = False
+                    page_items = []
+                    reached_cutoff = False
+                    reached_known = False
 
-                for row in rows:
-                    try:
-                        title_sel = selectors.get('title')
-                        title_elem = row.select_one(title_sel) if title_sel else row.select_one('a')
-                        
-                        if not title_elem:
-                            continue
-                            
-                        title = title_elem.get_text(strip=True)
-                        link_href = title_elem.get('href')
-                        
-                        if link_href:
-                            if not link_href.startswith('http'):
-                                from urllib.parse import urljoin
-                                link = urljoin(base_url, link_href)
-                            else:
-                                link = link_href
-                        else:
-                            link = base_url
+                    for row in rows:
+                        try:
+                            fields = plan.extract_row(row, base_url)
+                            if not fields:
+                                continue
+
+                            title = fields['title']
+                            link = fields['link']
 
-                        date_sel = selectors.get('date')
-                        date_str = ""
-                        if date_sel:
-                            date_elem = row.select_one(date_sel)
-                            if date_elem:
-                                date_str = date_elem.get_text(strip=True)
+                            pub_date = self._parse_date(fields['date'])
 
-                        pub_date = self._parse_date(date_str)
+                            if link in known:
+                                # Only ordinary dated rows with their own link count towards the stop
+                                if pub_date and link != base_url:
+                                    consecutive_known += 1
+                                    if consecutive_known >= settings.KNOWN_LINK_STOP_ROWS:
+                                        reached_known = True
+                                        break
+                                continue
+                            consecutive_known = 0
                         
-                        if pub_date:
-                            if pub_date >= cutoff_date:
+                            if pub_date:
+                                if pub_date >= cutoff_date:
+                                    page_items.append({
+                                        'title': title,
+                                        'link': link,
+                                        'published_at': pub_date.isoformat(),
+                                        'agency': agency_config.get('code'),
+                                        'category': agency_config.get('category', 'press_release')
+                                    })
+                                else:
+                                    reached_cutoff = True
+                            else:
                                 page_items.append({
                                     'title': title,
                                     'link': link,
-                                    'published_at': pub_date.isoformat(),
+                                    'published_at': now_kst.isoformat(),
                                     'agency': agency_config.get('code'),
                                     'category': agency_config.get('category', 'press_release')
                                 })
-                            else:
-                                reached_cutoff = True
-                        else:
-                            page_items.append({
-                                'title': title,
-                                'link': link,
-                                'published_at': now_kst.isoformat(),
-                                'agency': agency_config.get('code'),
-                                'category': agency_config.get('category', 'press_release')
-                            })
 
-                    except Exception as e:
-                        logger.error(f"Error parsing row: {e}")
-                        continue
+                        except Exception as e:
+                            logger.error(f"Error parsing row: {e}")
+                            continue
                 
-                if page_items:
-                    all_items.extend(page_items)
-                    logger.info(f"    > Found {len(page_items)} items on Page {page}.")
+                    if page_items:
+                        all_items.extend(page_items)
+                        logger.info(f"    > Found {len(page_items)} items on Page {page}.")
                 
-                if reached_cutoff:
-                    logger.info(f"  [{agency_config.get('code')}] Reached cutoff on Page {page}. Stopping.")
-                    break
+                    if reached_known:
+                        logger.info(f"  [{agency_config.get('code')}] Reached known link on Page {page}. Stopping.")
+                        break
+
+                    if reached_cutoff:
+                        logger.info(f"  [{agency_config.get('code')}] Reached cutoff on Page {page}. Stopping.")
+                        break
                 
-                if len(rows) < 3:
-                    break
+                    if len(rows) < 3:
+                        break
                     
-                page += 1
+                    page += 1
 
-            except Exception as e:
-                logger.error(f"[{agency_config.get('code')}] Error fetching page {page}: {e}")
-                break
+                except Exception as e:
+                    logger.error(f"[{agency_config.get('code')}] Error fetching page {page}: {e}")
+                    break
 
         return all_items
 
-    def fetch_content(self, url: str, agency_config: Dict) -> Optional[str]:
+    def fetch_content(self, url: str, agency_config: Dict, raise_errors: bool = False) -> Optional[str]:
         """
         Fetches article content based on agency configuration (selectors).
+        raise_errors=True re-raises request errors (timeouts, HTTP status) so the caller
+        can retry them (see content_pool.ContentFetchPool); parse problems still return None.
         """
-        scraper_config = agency_config.get('scraper') or agency_config.get('selector')
-        if not scraper_config:
+        plan = self._plan(agency_config)
+        if not plan:
             logger.debug(f"No scraper/selector config for {agency_config.get('code')}")
             return None
+
+        container_selector = plan.content_selector
+        if not container_selector:
+            return None
         
         try:
-            # Random delay
-            time.sleep(random.uniform(settings.SCRAPER_RETRY_DELAY_MIN, settings.SCRAPER_RETRY_DELAY_MAX))
-            
-            response = requests.get(url, headers=self.headers, timeout=settings.SCRAPER_TIMEOUT, verify=settings.SSL_VERIFY)
+            response = self.fetcher.get(url, headers=self.headers, timeout=settings.SCRAPER_TIMEOUT, verify=settings.SSL_VERIFY)
             response.raise_for_status()
+
+            soup = parse_html(response, container_selector)
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            container_selector = scraper_config.get('container_selector') or scraper_config.get('content')
-            
-            if not container_selector:
-                return None
-                
-            content_div = soup.select_one(container_selector)
+            # Container with remove_selectors already stripped
+            content_div = plan.content_of(soup)
             if not content_div:
                 logger.warning(f"Container not found for {url} ({container_selector})")
                 return None
             
-            # Remove unwanted elements
-            remove_selectors = scraper_config.get('remove_selectors', [])
-            for sel in remove_selectors:
-                for match in content_div.select(sel):
-                    match.decompose()
-            
             # Extract text
             text_content = content_div.get_text(separator='\n', strip=True)
             
@@ -218,6 +282,8 @@ class ContentScraper:
             return text_content
 
         except Exception as e:
+            if raise_errors and isinstance(e, RequestException):
+                raise
             logger.error(f"Error scraping content from {url}: {e}")
             return None
 
@@ -286,7 +352,6 @@ class ContentScraper:
             return []
         
         import pytz
-        from urllib.parse import urljoin
         kst = pytz.timezone('Asia/Seoul')
         now_kst = datetime.now(kst)
         cutoff_date = now_kst - timedelta(days=30)  # Sanctions are less frequent, use 30 days
@@ -303,130 +368,138 @@ class ContentScraper:
         all_items = []
         page = 1
         max_pages = 10
-        
-        while page <= max_pages:
-            page_url = f"{full_url}&pageIndex={page}"
-            
-            try:
-                time.sleep(random.uniform(1.0, 2.0))
-                response = requests.get(page_url, headers=self.headers, timeout=settings.SCRAPER_TIMEOUT, verify=settings.SSL_VERIFY)
-                response.raise_for_status()
+        pages = self.paginate(code, lambda n: f"{full_url}&pageIndex={n}", max_pages)
+
+        with pages:
+            while page <= max_pages:
+                try:
+                    response = pages.get(page)
+                    response.raise_for_status()
                 
-                soup = BeautifulSoup(response.content, 'html.parser')
+                    soup = parse_html(response, SanctionRowPlan.ROWS)
                 
-                # Find all list items (table rows)
-                items = soup.select('tbody tr')
+                    # Find all list items (table rows)
+                    items = soup.select(SanctionRowPlan.ROWS)
                 
-                if not items:
-                    logger.info(f"  [{code}] No items found on page {page}. Stopping.")
-                    break
+                    if not items:
+                        logger.info(f"  [{code}] No items found on page {page}. Stopping.")
+                        break
                 
-                page_items = []
+                    page_items = []
                 
-                for item in items:
-                    try:
-                        # Extract institution name (제재대상기관) - 2nd column
-                        inst_elem = item.select_one('td:nth-child(2)')
-                        if not inst_elem:
-                            continue
-                        
-                        # Remove mobile-only spans and get clean text
-                        for span in inst_elem.select('span.only-m'):
-                            span.decompose()
-                        institution = inst_elem.get_text(strip=True)
-                        
-                        if not institution:
-                            continue
-                        
-                        # Apply filter: must contain at least one filter keyword
-                        if filter_keywords:
-                            if not any(kw in institution for kw in filter_keywords):
+                    for item in items:
+                        try:
+                            # Institution (제재대상기관, 2nd column), date (제재조치요구일, 3rd column)
+                            # and detail/PDF link (4th column) via precompiled selectors
+                            fields = self.sanction_plan.extract_row(item, base_domain)
+                            if not fields:
                                 continue
+                            institution = fields['title']
                         
-                        # Apply exclude: must not contain any exclude keyword
-                        if exclude_keywords:
-                            if any(kw in institution for kw in exclude_keywords):
+                            if not institution:
                                 continue
                         
-                        # Extract date (제재조치요구일) - 3rd column
-                        date_elem = item.select_one('td:nth-child(3)')
-                        date_str = ""
-                        if date_elem:
-                            for span in date_elem.select('span.only-m'):
-                                span.decompose()
-                            date_str = date_elem.get_text(strip=True)
+                            # Apply filter: must contain at least one filter keyword
+                            if filter_keywords:
+                                if not any(kw in institution for kw in filter_keywords):
+                                    continue
                         
-                        # Extract link to detail page or PDF - 4th column
-                        link_elem = item.select_one('td:nth-child(4) a')
-                        if not link_elem:
-                            link_elem = item.select_one('a[href*="view.do"]')
-                        if not link_elem:
-                            link_elem = item.select_one('a[href*="hpdownload"]')
+                            # Apply exclude: must not contain any exclude keyword
+                            if exclude_keywords:
+                                if any(kw in institution for kw in exclude_keywords):
+                                    continue
                         
-                        if link_elem:
-                            href = link_elem.get('href', '')
-                            if not href.startswith('http'):
-                                link = urljoin(base_domain, href)
-                            else:
-                                link = href
-                        else:
-                            continue
+                            link = fields['link']
+                            if not link:
+                                continue
                         
-                        # Parse date
-                        pub_date = self._parse_date(date_str)
-                        if not pub_date:
-                            pub_date = now_kst
+                            # Parse date
+                            pub_date = self._parse_date(fields['date'])
+                            if not pub_date:
+                                pub_date = now_kst
                         
-                        # Check if PDF link (경영유의사항 has direct PDF links)
-                        pdf_url = None
-                        if 'hpdownload' in link:
-                            pdf_url = link
-                        else:
-                            # Need to fetch detail page to get PDF (검사결과 제재)
-                            pdf_url = self._extract_pdf_from_detail(link, base_domain)
+                            # Check if PDF link (경영유의사항 has direct PDF links);
+                            # detail pages (검사결과 제재) are resolved after the list scan
+                            pdf_url = link if 'hpdownload' in link else None
                         
-                        page_items.append({
-                            'title': institution,
-                            'link': link,
-                            'published_at': pub_date.isoformat(),
-                            'agency': code,
-                            'category': 'sanction_notice',
-                            'pdf_url': pdf_url
-                        })
+                            page_items.append({
+                                'title': institution,
+                                'link': link,
+                                'published_at': pub_date.isoformat(),
+                                'agency': code,
+                                'category': 'sanction_notice',
+                                'pdf_url': pdf_url,
+                                'sanction_key': build_sanction_key(code, link)
+                            })
                         
-                    except Exception as e:
-                        logger.error(f"Error parsing sanction item: {e}")
-                        continue
+                        except Exception as e:
+                            logger.error(f"Error parsing sanction item: {e}")
+                            continue
                 
-                if page_items:
-                    all_items.extend(page_items)
-                    logger.info(f"  [{code}] Found {len(page_items)} matching items on page {page}.")
+                    if page_items:
+                        all_items.extend(page_items)
+                        logger.info(f"  [{code}] Found {len(page_items)} matching items on page {page}.")
                 
-                if len(items) < 5:
-                    break
+                    if len(items) < 5:
+                        break
                     
-                page += 1
+                    page += 1
                 
-            except Exception as e:
-                logger.error(f"[{code}] Error fetching page {page}: {e}")
-                break
-        
+                except Exception as e:
+                    logger.error(f"[{code}] Error fetching page {page}: {e}")
+                    break
+
+        self._resolve_sanction_pdfs(code, [i for i in all_items if not i['pdf_url']], base_domain)
+
         logger.info(f"[{code}] Total collected: {len(all_items)} sanction notices.")
         return all_items
 
+    def _resolve_sanction_pdfs(self, code: str, items: List[Dict], base_domain: str):
+        """
+        Fills item['pdf_url'] from the persistent cache, fetching the detail pages of
+        unknown sanctions concurrently (per-host limits of the shared fetcher apply).
+        Only found links are cached, so a notice whose PDF is not posted yet is retried next cycle.
+        """
+        misses = []
+        for item in items:
+            # Keyed per board: FSS_SANCTION and FSS_MGMT_NOTICE IDs may collide
+            key = build_sanction_key(code, item['link'])
+            cached = self.sanction_pdfs.get(key) if key else None
+            if cached:
+                item['pdf_url'] = cached
+            else:
+                misses.append((item, key))
+        if not misses:
+            if items:
+                logger.info(f"  [{code}] PDF links: {len(items)} from cache.")
+            return
+
+        workers = min(settings.SANCTION_PDF_WORKERS, len(misses))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='sanction-pdf') as executor:
+            results = executor.map(lambda miss: self._extract_pdf_from_detail(miss[0]['link'], base_domain), misses)
+            resolved = 0
+            for (item, key), pdf_url in zip(misses, results):
+                item['pdf_url'] = pdf_url
+                if pdf_url and key:
+                    self.sanction_pdfs.set(key, pdf_url, save=False)
+                    resolved += 1
+        if resolved:
+            self.sanction_pdfs.save()
+        logger.info(f"  [{code}] PDF links: {len(items) - len(misses)} from cache, "
+                    f"{resolved}/{len(misses)} resolved from detail pages.")
+
     def _extract_pdf_from_detail(self, detail_url: str, base_domain: str) -> Optional[str]:
         """
         Fetches detail page and extracts PDF download link.
         """
         try:
-            time.sleep(random.uniform(0.5, 1.0))
-            response = requests.get(detail_url, headers=self.headers, timeout=settings.SCRAPER_TIMEOUT, verify=settings.SSL_VERIFY)
+            response = self.fetcher.get(detail_url, headers=self.headers, timeout=settings.SCRAPER_TIMEOUT, verify=settings.SSL_VERIFY)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = parse_html(response, SanctionRowPlan.PDF_LINK)
             
             # Find PDF download link
-            pdf_link = soup.select_one('a[href*="hpdownload"]')
+            pdf_link = SanctionRowPlan.PDF_LINK_MATCHER.select_one(soup)
             if pdf_link:
                 href = pdf_link.get('href', '')
                 if not href.startswith('http'):
@@ -0,0 +1,139 @@
+"""
+Precompiled extraction plans for scraped list pages.
+
+Each agency's "selector" block in agencies.json is compiled once with soupsieve
+into an ExtractionPlan that pulls title, link, date and ID out of a list row in a
+single call. Invalid selectors raise SelectorConfigError when the plans are built
+(at pipeline start-up) instead of failing row by row during a cycle.
+"""
+
+import logging
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import parse_qs, urljoin, urlparse
+
+import soupsieve as sv
+
+logger = logging.getLogger(__name__)
+
+
+class SelectorConfigError(ValueError):
+    pass
+
+
+def _compile(code: str, field: str, selector: Optional[str]):
+    if not selector:
+        return None
+    try:
+        return sv.compile(selector)
+    except Exception as e:
+        raise SelectorConfigError(f"[{code}] invalid '{field}' selector {selector!r}: {e}") from e
+
+
+class ExtractionPlan:
+    def __init__(self, code: str, selectors: Dict):
+        self.code = code
+        self.list_selector = selectors.get('list')
+        self.content_selector = selectors.get('container_selector') or selectors.get('content')
+        self.id_param = selectors.get('id_param')
+
+        self.list = _compile(code, 'list', self.list_selector)
+        self.title = _compile(code, 'title', selectors.get('title') or 'a')
+        # The link usually is the title anchor: reuse that element instead of selecting again
+        link_selector = selectors.get('link')
+        self.link = None if not link_selector or link_selector == (selectors.get('title') or 'a') \
+            else _compile(code, 'link', link_selector)
+        self.date = _compile(code, 'date', selectors.get('date'))
+        self.id = _compile(code, 'id', selectors.get('id'))
+        self.content = _compile(code, 'content', self.content_selector)
+        self.remove = [_compile(code, 'remove_selectors', s) for s in selectors.get('remove_selectors', [])]
+
+    def rows(self, soup) -> List:
+        return self.list.select(soup) if self.list else []
+
+    def extract_row(self, row, base_url: str) -> Optional[Dict[str, str]]:
+        """Returns {'title', 'link', 'date', 'id'} for a list row, or None if it has no title element."""
+        title_elem = self.title.select_one(row)
+        if not title_elem:
+            return None
+
+        link_elem = self.link.select_one(row) if self.link else title_elem
+        href = link_elem.get('href') if link_elem else None
+        link = urljoin(base_url, href) if href else base_url
+
+        date_elem = self.date.select_one(row) if self.date else None
+
+        item_id = None
+        if self.id:
+            id_elem = self.id.select_one(row)
+            item_id = id_elem.get_text(strip=True) if id_elem else None
+        elif self.id_param:
+            values = parse_qs(urlparse(link).query).get(self.id_param)
+            item_id = values[0] if values else None
+
+        return {
+            'title': title_elem.get_text(strip=True),
+            'link': link,
+            'date': date_elem.get_text(strip=True) if date_elem else '',
+            'id': item_id,
+        }
+
+    def content_of(self, soup):
+        """The content container with remove_selectors stripped, or None."""
+        container = self.content.select_one(soup) if self.content else None
+        if container is not None:
+            for remove in self.remove:
+                for match in remove.select(container):
+                    match.decompose()
+        return container
+
+
+class SanctionRowPlan:
+    """
+    FSS sanction list rows: institution (2nd column), date (3rd column) and the
+    detail/PDF link (4th column), with mobile-only labels stripped from the
+    institution and date cells.
+    """
+
+    MOBILE_LABELS = sv.compile('span.only-m')
+    ROWS = 'tbody tr'
+    INSTITUTION = sv.compile('td:nth-child(2)')
+    DATE = sv.compile('td:nth-child(3)')
+    LINKS = [sv.compile('td:nth-child(4) a'), sv.compile('a[href*="view.do"]'), sv.compile('a[href*="hpdownload"]')]
+    PDF_LINK = 'a[href*="hpdownload"]'
+    PDF_LINK_MATCHER = sv.compile(PDF_LINK)
+
+    def _cell_text(self, cell) -> str:
+        for span in self.MOBILE_LABELS.select(cell):
+            span.decompose()
+        return cell.get_text(strip=True)
+
+    def extract_row(self, row, base_url: str) -> Optional[Dict[str, str]]:
+        """Returns {'title', 'date', 'link'} for a row, or None without an institution cell."""
+        institution = self.INSTITUTION.select_one(row)
+        if not institution:
+            return None
+        date = self.DATE.select_one(row)
+
+        link_elem = None
+        for matcher in self.LINKS:
+            link_elem = matcher.select_one(row)
+            if link_elem:
+                break
+
+        return {
+            'title': self._cell_text(institution),
+            'date': self._cell_text(date) if date else '',
+            'link': urljoin(base_url, link_elem.get('href', '')) if link_elem else None,
+        }
+
+
+def compile_plans(agencies: Iterable[Dict]) -> Dict[str, ExtractionPlan]:
+    """Compiles every agency with a selector block; raises SelectorConfigError on the first invalid one."""
+    plans = {}
+    for agency in agencies:
+        selectors = agency.get('selector') or agency.get('scraper')
+        code = agency.get('code') or agency.get('id')
+        if selectors:
+            plans[code] = ExtractionPlan(code, selectors)
+    logger.info(f"Compiled selector plans for {len(plans)} agencies")
+    return plans
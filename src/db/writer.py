@@ -0,0 +1,119 @@
+"""
+Buffered bulk writer for the articles table.
+
+Collects rows and flushes them as batched `upsert(..., on_conflict='link',
+ignore_duplicates=True)` calls instead of one insert round trip per article.
+Only rows that were actually inserted come back from a flush, so callers can
+fire notifications exactly once per new article.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ArticleWriter:
+    def __init__(self, client, batch_size: int = None, flush_interval: float = None,
+                 table: str = 'articles', on_conflict: str = 'link'):
+        self.client = client
+        self.batch_size = batch_size or settings.DB_WRITE_BATCH_SIZE
+        self.flush_interval = flush_interval if flush_interval is not None else settings.DB_FLUSH_INTERVAL_SECONDS
+        self.table = table
+        self.on_conflict = on_conflict
+
+        self._buffer: List[Tuple[Dict, Any]] = []
+        self._first_buffered_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+        self.failed: List[Any] = []
+        # Refs confirmed in the table (inserted or already present) since the last take_stored()
+        self._stored: List[Any] = []
+        self.stats = {'rows': 0, 'inserted': 0, 'existing': 0, 'failed': 0, 'flushes': 0}
+
+    def add(self, row: Dict, ref: Any = None) -> List[Any]:
+        """
+        Buffers a row. `ref` is any caller object identifying the row (defaults to the row).
+        Flushes when the buffer reaches batch_size or the oldest row has waited flush_interval
+        seconds, and returns the refs of rows inserted by that flush (empty otherwise).
+        """
+        with self._lock:
+            self._buffer.append((row, ref if ref is not None else row))
+            self.stats['rows'] += 1
+            if self._first_buffered_at is None:
+                self._first_buffered_at = time.monotonic()
+            due = (len(self._buffer) >= self.batch_size or
+                   time.monotonic() - self._first_buffered_at >= self.flush_interval)
+        return self.flush() if due else []
+
+    def flush(self) -> List[Any]:
+        """Writes all buffered rows. Returns refs of rows that were newly inserted."""
+        with self._lock:
+            pending, self._buffer = self._buffer, []
+            self._first_buffered_at = None
+        if not pending:
+            return []
+        if not self.client:
+            return []
+
+        # Bulk inserts need identical keys per request, so group rows by their key set
+        groups: Dict[Tuple[str, ...], List[Tuple[Dict, Any]]] = {}
+        for row, ref in pending:
+            groups.setdefault(tuple(sorted(row.keys())), []).append((row, ref))
+
+        inserted_refs = []
+        for entries in groups.values():
+            inserted_refs.extend(self._write_group(entries))
+
+        with self._lock:
+            self.stats['flushes'] += 1
+            self.stats['inserted'] += len(inserted_refs)
+        logger.info(f"  > DB flush: {len(pending)} rows, {len(inserted_refs)} new.")
+        return inserted_refs
+
+    def _upsert(self, rows: List[Dict]) -> set:
+        res = self.client.table(self.table).upsert(
+            rows, on_conflict=self.on_conflict, ignore_duplicates=True
+        ).execute()
+        return {r.get(self.on_conflict) for r in (res.data or [])}
+
+    def _write_group(self, entries: List[Tuple[Dict, Any]]) -> List[Any]:
+        rows = [row for row, _ in entries]
+        failed_ids = set()
+        try:
+            written = self._upsert(rows)
+        except Exception as e:
+            # One bad row should not drop the batch: retry row by row
+            logger.error(f"Bulk upsert of {len(rows)} rows failed, retrying individually: {e}")
+            written = set()
+            for row, ref in entries:
+                try:
+                    written |= self._upsert([row])
+                except Exception as row_error:
+                    logger.error(f"  > Failed to save to DB: {row_error}")
+                    failed_ids.add(id(ref))
+                    with self._lock:
+                        self.failed.append(ref)
+                        self.stats['failed'] += 1
+
+        inserted = []
+        for row, ref in entries:
+            if row.get(self.on_conflict) in written:
+                inserted.append(ref)
+            elif id(ref) not in failed_ids:
+                with self._lock:
+                    self.stats['existing'] += 1
+                    self._stored.append(ref)
+        with self._lock:
+            self._stored.extend(inserted)
+        return inserted
+
+    def take_stored(self) -> List[Any]:
+        """Returns and clears the refs of rows confirmed in the table (inserted or already existing)."""
+        with self._lock:
+            stored, self._stored = self._stored, []
+        return stored
@@ -1,10 +1,18 @@
 import logging
 import json
 import os
-from datetime import datetime
-from src.collectors.rss_parser import collect_all_rss
-from src.collectors.scraper import ContentScraper
+import time
+from datetime import datetime, timedelta, timezone
+from src.collectors.content_pool import ContentFetchPool
+from src.collectors.scraper import ContentScraper, build_sanction_key
+from src.collectors.engine import CollectionEngine, SANCTION_AGENCIES
+from src.collectors.rss_parser import commit_feed_validators, discard_feed_validators
+from src.db.writer import ArticleWriter
+from src.services.near_duplicates import NearDuplicateIndex
+from src.services.priority import PriorityScorer
+from src.utils.stages import Stage, StagedRunner
 from src.utils.logger import setup_logger
+from config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +26,12 @@ class Pipeline:
         self.notifier = self._init_notifier()
         self.supabase = self._init_db()
         self.scraper = ContentScraper()
+        self.scraper.fetcher.configure_agencies(self.agency_map.values())
+        # Fail fast on invalid selectors instead of row by row during a cycle
+        self.scraper.compile_plans(self.agency_map.values())
+        self.content_pool = ContentFetchPool(self.scraper)
+        self.writer = ArticleWriter(self.supabase)
+        self.prioritizer = PriorityScorer(self.agency_map)
 
     def _load_agency_map(self):
         try:
@@ -76,161 +90,448 @@ class Pipeline:
             logger.error(f"DB Check failed: {e}")
             return False
 
+    def _filter_new_items(self, items, seen=None):
+        """
+        Batch duplicate detection for a whole collection cycle.
+        Checks all candidate links with a few chunked `in_` queries instead of one
+        round trip per item. Sanction items are checked the same way on sanction_key.
+        `seen` carries links/keys across calls when a cycle is deduplicated in parts.
+
+        Returns (new_items, duplicate_items).
+        """
+        started = time.monotonic()
+        new_items, duplicates = [], []
+        batch_seen = seen if seen is not None else set()
+        candidates = []
+
+        for item in items:
+            link = item['link']
+            if link in batch_seen:
+                duplicates.append(item)
+                continue
+            batch_seen.add(link)
+            candidates.append(item)
+
+        sanction_items = [i for i in candidates if i['agency'] in SANCTION_AGENCIES]
+        link_items = [i for i in candidates if i['agency'] not in SANCTION_AGENCIES]
+
+        existing_links = set()
+        if self.supabase and link_items:
+            links = [i['link'] for i in link_items]
+            chunk_size = settings.DEDUP_CHUNK_SIZE
+            for start in range(0, len(links), chunk_size):
+                chunk = links[start:start + chunk_size]
+                try:
+                    res = self.supabase.table('articles').select('link').in_('link', chunk).execute()
+                    existing_links.update(r['link'] for r in (res.data or []))
+                except Exception as e:
+                    logger.error(f"Batch dedup query failed: {e}")
+
+        for item in link_items:
+            (duplicates if item['link'] in existing_links else new_items).append(item)
+
+        # Sanctions: one batched lookup on the indexed sanction_key, link check for the rest
+        existing_keys = set()
+        keyed = []
+        for item in sanction_items:
+            item['sanction_key'] = item.get('sanction_key') or build_sanction_key(item['agency'], item['link'])
+            if item['sanction_key'] in batch_seen:
+                duplicates.append(item)
+            elif item['sanction_key']:
+                batch_seen.add(item['sanction_key'])
+                keyed.append(item)
+            elif self._is_duplicate(item['link']):
+                duplicates.append(item)
+            else:
+                new_items.append(item)
+
+        if self.supabase and keyed:
+            keys = [i['sanction_key'] for i in keyed]
+            for start in range(0, len(keys), settings.DEDUP_CHUNK_SIZE):
+                chunk = keys[start:start + settings.DEDUP_CHUNK_SIZE]
+                try:
+                    res = self.supabase.table('articles').select('sanction_key').in_('sanction_key', chunk).execute()
+                    existing_keys.update(r['sanction_key'] for r in (res.data or []))
+                except Exception as e:
+                    logger.error(f"Batch sanction dedup query failed: {e}")
+
+        for item in keyed:
+            (duplicates if item['sanction_key'] in existing_keys else new_items).append(item)
+
+        elapsed = time.monotonic() - started
+        self.last_dedup_seconds = round(elapsed, 2)
+        logger.info(f"Dedup: {len(items)} candidates -> {len(new_items)} new, "
+                    f"{len(duplicates)} duplicates in {elapsed:.2f}s")
+        return new_items, duplicates
+
+    def _load_near_duplicate_index(self):
+        """Index of recently stored articles (NEAR_DUP_LOOKBACK_DAYS) keyed by link, payload = analysis_result."""
+        index = NearDuplicateIndex()
+        if not self.supabase:
+            return index
+        since = (datetime.now(timezone.utc) - timedelta(days=settings.NEAR_DUP_LOOKBACK_DAYS)).isoformat()
+        try:
+            rows = self.supabase.table('articles') \
+                .select('link, title, analysis_result') \
+                .in_('category', settings.NEAR_DUP_CATEGORIES) \
+                .gte('published_at', since) \
+                .order('published_at', desc=True) \
+                .limit(settings.NEAR_DUP_MAX_RECENT) \
+                .execute().data or []
+        except Exception as e:
+            logger.error(f"Near-duplicate index load failed: {e}")
+            return index
+        for row in rows:
+            index.add(row['link'], row.get('title', ''), payload=row)
+        return index
+
+    def _split_near_duplicates(self, items, index=None):
+        """
+        Separates copies of the same release arriving through different sources/links.
+        Returns (originals, near_duplicates) where near_duplicates is a list of
+        (item, original) and original is either a stored row or an earlier item of this cycle.
+        Pass the cycle's index when splitting a cycle in parts.
+        """
+        if not settings.NEAR_DUP_ENABLED:
+            return items, []
+
+        index = index if index is not None else self._load_near_duplicate_index()
+        originals, near_duplicates = [], []
+        for item in items:
+            if item.get('category', 'press_release') not in settings.NEAR_DUP_CATEGORIES:
+                originals.append(item)
+                continue
+            match = index.query(item['title'], exclude=item['link'])
+            if match:
+                _, similarity, original = match
+                logger.info(f"Near-duplicate ({similarity:.2f}): [{item['agency']}] {item['title'][:40]} "
+                            f"-> {original['link']}")
+                near_duplicates.append((item, original))
+            else:
+                index.add(item['link'], item['title'], payload=item)
+                originals.append(item)
+        return originals, near_duplicates
+
     def _is_sanction_duplicate(self, link, agency_id):
         """
-        Sanction-specific duplicate check using examMgmtNo and emOpenSeq.
-        FSS sanction URLs have varying date params, so we extract the unique IDs.
+        Sanction-specific duplicate check using the canonical sanction_key
+        (agency + examMgmtNo + emOpenSeq), a single indexed lookup.
+        FSS sanction URLs have varying date params, so the link alone is not stable.
         """
         if not self.supabase:
             return False
         try:
-            from urllib.parse import urlparse, parse_qs
-            parsed = urlparse(link)
-            params = parse_qs(parsed.query)
-            
-            exam_id = params.get('examMgmtNo', [None])[0]
-            seq = params.get('emOpenSeq', [None])[0]
-            
-            if exam_id and seq:
-                # Check if this exact sanction already exists
-                existing = self.supabase.table('articles').select('id, link').eq('agency', agency_id).execute()
-                for record in existing.data:
-                    existing_parsed = urlparse(record['link'])
-                    existing_params = parse_qs(existing_parsed.query)
-                    existing_exam = existing_params.get('examMgmtNo', [None])[0]
-                    existing_seq = existing_params.get('emOpenSeq', [None])[0]
-                    if existing_exam == exam_id and existing_seq == seq:
-                        return True
-                return False
-            else:
-                # Fallback to standard link check for PDF links or other formats
-                return self._is_duplicate(link)
+            key = build_sanction_key(agency_id, link)
+            if key:
+                existing = self.supabase.table('articles').select('id').eq('sanction_key', key).limit(1).execute()
+                return bool(existing.data)
+            # Fallback to standard link check for PDF links or other formats
+            return self._is_duplicate(link)
         except Exception as e:
             logger.error(f"Sanction duplicate check failed: {e}")
             return False
 
+    def _build_row(self, item):
+        data = {
+            "agency": item['agency'],
+            "title": item['title'],
+            "link": item['link'],
+            "published_at": item.get('published_at') or datetime.now().isoformat(),
+            "content": item.get('content') or "",
+            "analysis_result": item.get('analysis_result'),
+            "category": item.get('category', 'press_release')
+        }
+        if item.get('sanction_key'):
+            data["sanction_key"] = item['sanction_key']
+        if item.get('duplicate_of'):
+            data["duplicate_of"] = item['duplicate_of']
+        return data
+
     def _save_to_db(self, item):
+        """
+        Queues the item in the buffered writer. Notifications for rows the flush
+        actually inserted are sent from here, so each new article alerts once.
+        Without a DB the item is notified directly.
+        """
         if not self.supabase:
+            self._notify_inserted([item])
             return
-        try:
-            data = {
-                "agency": item['agency'],
-                "title": item['title'],
-                "link": item['link'],
-                "published_at": item.get('published_at') or datetime.now().isoformat(),
-                "content": item.get('content') or "",
-                "analysis_result": item.get('analysis_result'),
-                "category": item.get('category', 'press_release')
-            }
-            self.supabase.table("articles").insert(data).execute()
-            logger.info("  > Saved to DB.")
-        except Exception as e:
-            logger.error(f"  > Failed to save to DB: {e}")
+        self._notify_inserted(self._write(item))
+
+    def _write(self, item):
+        """
+        Buffers the row and returns the items inserted by any resulting flush. Rows that
+        will alert are flushed right away, so batching never delays a notification;
+        only rows that do not alert wait for a full batch or DB_FLUSH_INTERVAL_SECONDS.
+        """
+        inserted = self.writer.add(self._build_row(item), item)
+        if self._will_alert(item):
+            inserted.extend(self.writer.flush())
+        return inserted
+
+    def flush_writes(self):
+        """Flushes pending DB writes and notifies for newly inserted articles."""
+        self._notify_inserted(self.writer.flush())
+
+    def _will_alert(self, item):
+        """Analyzed originals alert; near-duplicates do not (the original already alerted)."""
+        analysis_result = item.get('analysis_result')
+        return bool(self.notifier and analysis_result and analysis_result.get('analysis_status') == 'ANALYZED'
+                    and not item.get('duplicate_of'))
+
+    def _notify_inserted(self, items):
+        """Sends alerts for analyzed originals among `items`; returns the items actually alerted."""
+        sent = []
+        for item in items:
+            if not self._will_alert(item):
+                continue
+            analysis_result = item['analysis_result']
+            agency_config = self.agency_map.get(item['agency'])
+            a_name = agency_config.get('name', item['agency']) if agency_config else item['agency']
+            logger.info(f"  > Sending Notification: {item['title'][:40]}")
+            try:
+                self.notifier.format_and_send(a_name, item['title'], item['link'], analysis_result)
+                sent.append(item)
+            except Exception as e:
+                logger.error(f"Notification failed: {e}")
+        return sent
 
     def run(self):
+        """
+        One collection cycle as a streaming staged pipeline:
+        collect -> dedup -> triage (rules / Tier 1) -> fetch content -> analyze (Tier 2) -> save -> notify.
+        Each agency's items enter dedup as soon as that agency finishes, and every stage
+        has its own workers and bounded queue (STAGE_WORKERS, STAGE_QUEUE_SIZE).
+        """
         logger.info("Starting MarketPulse-Reg Pipeline...")
-        all_items = []
+        self._cycle_started = time.monotonic()
+        self._notify_latencies = {}
+        self._cycle_seen = set()
+        self._cycle_new_items = []
+        self._near_duplicates = []
+        self._near_dup_index = self._load_near_duplicate_index() if settings.NEAR_DUP_ENABLED else None
+        self.writer.take_stored()
+        discard_feed_validators()
+        handled_links = {}
 
-        # 1. RSS Collection
-        try:
-            rss_items = collect_all_rss()
-            logger.info(f"Collected {len(rss_items)} items from RSS targets.")
-            all_items.extend(rss_items)
-        except Exception as e:
-            logger.error(f"RSS Collection failed: {e}")
-
-        # 2. Scraper Collection
-        scraper_targets = [a for a in self.agency_map.values() if a.get('collection_method') == 'scraper']
-        for agency in scraper_targets:
-            agency_id = agency.get('code') or agency.get('id')
-            
-            # Skip sanction notice agencies here (they use a different method)
-            if agency_id in ['FSS_SANCTION', 'FSS_MGMT_NOTICE']:
-                continue
-            
-            logger.info(f"Starting HTML scraping for {agency_id}...")
-            
-            last_date = self._get_last_crawled_date(agency_id)
+        def record_duplicates(items):
+            for item in items:
+                handled_links.setdefault(item['agency'], []).append(item['link'])
+
+        self._stages = StagedRunner(self._build_stages(record_duplicates))
+        engine = CollectionEngine(self.scraper, self.agency_map, last_crawled_lookup=self._get_last_crawled_date)
+        collected = {}
+
+        def collect():
+            # 1. Collection (all agencies concurrently: RSS, scrapers, sanction notices)
+            collected.update(engine.run(on_items=lambda agency_id, items: self._stages.put('dedup', items)))
+
+        self._stages.run(collect)
+        self.last_collection_timings = collected.get('timings', {})
+        self.last_stage_stats = self._stages.stats()
+        self.last_time_to_notify = {
+            priority_class: {
+                'count': len(latencies),
+                'avg_seconds': round(sum(latencies) / len(latencies), 2),
+                'max_seconds': round(max(latencies), 2),
+            }
+            for priority_class, latencies in self._notify_latencies.items()
+        }
+
+        # Only links confirmed in the DB count as handled: an item lost in a failed stage
+        # (or a failed write) must be collected again next cycle
+        stored = self.writer.take_stored() if self.supabase else []
+        for item in stored:
+            handled_links.setdefault(item['agency'], []).append(item['link'])
+        stored_links = {item['link'] for item in stored}
+        lost_items = [i for i in self._cycle_new_items if i['link'] not in stored_links] if self.supabase else []
+        lost_links = {item['link'] for item in lost_items}
+        if lost_items:
+            logger.warning(f"{len(lost_items)} new items were not saved this cycle; they stay unknown for the next one")
+
+        # Remember handled scraper links and feed validators for the next cycle
+        for agency_id, links in handled_links.items():
+            agency = self.agency_map.get(agency_id) or {}
+            if agency.get('collection_method') == 'scraper' and agency_id not in SANCTION_AGENCIES:
+                self.scraper.remember_links(agency_id, [link for link in links if link not in lost_links])
+        commit_feed_validators(skip_agencies={item['agency'] for item in lost_items})
+
+        self.scraper.fetcher.log_stats()
+        self.scraper.prefetch_stats.log()
+        if not collected.get('items'):
+            logger.warning("No new items found from any source.")
+            return
+
+        logger.info(f"Processed {len(self._cycle_new_items)} new items "
+                    f"({len(self._near_duplicates)} near-duplicates).")
+        logger.info(f"Stages: {self.last_stage_stats}")
+        logger.info(f"Time to notify by priority: {self.last_time_to_notify}")
+        logger.info(f"DB writes: {self.writer.stats}")
+        logger.info(f"Content fetch: {dict(self.content_pool.stats)}")
+        if self.analyzer:
+            logger.info(f"Routing: {dict(self.analyzer.route_stats)}")
+            logger.info(f"Tier-2 models: {self.analyzer.router.report()}")
+            logger.info(f"Condenser: {dict(self.analyzer.condenser.stats)}")
+        if self.analyzer and self.analyzer.cache:
+            logger.info(f"LLM cache: {self.analyzer.cache.stats()}")
+
+        logger.info("Pipeline cycle completed successfully.")
+
+    def _build_stages(self, record_duplicates):
+        workers = settings.STAGE_WORKERS
+        size = settings.STAGE_QUEUE_SIZE
+
+        def dedup(items):
+            # 2. Deduplication against the DB and everything seen earlier this cycle
+            new_items, duplicates = self._filter_new_items(items, seen=self._cycle_seen)
+            record_duplicates(duplicates)
+            self._cycle_new_items.extend(new_items)
+            originals, near_duplicates = self._split_near_duplicates(new_items, index=self._near_dup_index)
+            self._near_duplicates.extend(near_duplicates)
+            for item in originals:
+                self.prioritizer.annotate(item)
+                logger.info(f"Processing: [{item['agency']}] {item['title']} (priority {item['priority']:.1f})")
+                self._stages.put('triage' if self.analyzer else 'save', item)
+
+        def triage(items):
+            # 3. Rules, local classifier and batched Tier 1 for whatever arrived together
+            jobs = [self._analysis_job(item) for item in items]
             try:
-                scraped_items = self.scraper.fetch_list_items(agency, last_crawled_date=last_date)
-                logger.info(f"  > Scraped {len(scraped_items)} new items from {agency_id}.")
-                all_items.extend(scraped_items)
+                results = self.analyzer.triage_many(jobs)
             except Exception as e:
-                logger.error(f"Scraping failed for {agency_id}: {e}")
+                # Save the batch unanalyzed rather than dropping it
+                logger.error(f"Triage failed for {len(items)} items: {e}")
+                results = [None] * len(items)
+            for item, job, result in zip(items, jobs, results):
+                item['analysis_result'] = result
+                if result is not None and self.analyzer.needs_analysis(result):
+                    self._stages.put('fetch', (item, job))
+                else:
+                    self._stages.put('save', item)
 
-        # 3. Sanction Notice Collection (separate handling)
-        sanction_targets = [a for a in self.agency_map.values() if a.get('code') in ['FSS_SANCTION', 'FSS_MGMT_NOTICE']]
-        for agency in sanction_targets:
-            agency_id = agency.get('code')
-            logger.info(f"Starting sanction notice scraping for {agency_id}...")
+        def fetch(work):
+            # 4. Article body, only for items bound for Tier 2
+            item, job = work
             try:
-                sanction_items = self.scraper.fetch_sanction_items(agency)
-                logger.info(f"  > Collected {len(sanction_items)} sanction notices from {agency_id}.")
-                all_items.extend(sanction_items)
+                job['article']['content'] = job['content_loader']()
             except Exception as e:
-                logger.error(f"Sanction scraping failed for {agency_id}: {e}")
+                logger.error(f"Content fetch failed for {item['link']}: {e}")
+            self._stages.put('analyze', work)
 
-        if not all_items:
-            logger.warning("No new items found from any source.")
-            return
+        def analyze(work):
+            # 5. Tier 2
+            item, job = work
+            try:
+                item['analysis_result'] = self.analyzer.deep_analyze(
+                    item['analysis_result'], job['article'], job['agency_name']
+                )
+            except Exception as e:
+                logger.error(f"Analysis failed: {e}")
+                item['analysis_result'] = None
+            self._stages.put('save', item)
 
-        logger.info(f"Total items to process: {len(all_items)}")
+        def save(item):
+            # 6. Buffered DB write; rows actually inserted move on to notification
+            # (without a DB every item goes straight to notification)
+            for inserted in (self._write(item) if self.supabase else [item]):
+                self._stages.put('notify', inserted)
 
-        # 3. Processing
-        for item in all_items:
-            self._process_single_item(item)
+        def flush():
+            for inserted in self.writer.flush():
+                self._stages.put('notify', inserted)
 
-        logger.info("Pipeline cycle completed successfully.")
+        def notify(item):
+            # 7. Telegram alerts; time-to-notify is measured from the start of the cycle
+            for sent in self._notify_inserted([item]):
+                self._notify_latencies.setdefault(sent.get('priority_class', 'unscored'), []).append(
+                    time.monotonic() - self._cycle_started
+                )
+
+        def finish_saving():
+            # Near-duplicates reuse the original's analysis and link to it (no second alert)
+            for item, original in self._near_duplicates:
+                item['duplicate_of'] = original['link']
+                item['analysis_result'] = original.get('analysis_result')
+                save(item)
+            flush()
+
+        # Downstream of dedup, likely high-impact items are served first
+        def priority(work):
+            item = work[0] if isinstance(work, tuple) else work
+            return item.get('priority', 0)
 
-    def _process_single_item(self, item):
+        return [
+            Stage('dedup', dedup, maxsize=size),
+            Stage('triage', triage, workers=workers['triage'], maxsize=size, priority=priority,
+                  batch_size=settings.FILTER_BATCH_MAX_ITEMS, linger=settings.STAGE_TRIAGE_LINGER_SECONDS),
+            Stage('fetch', fetch, workers=workers['fetch'], maxsize=size, priority=priority),
+            Stage('analyze', analyze, workers=workers['analyze'], maxsize=size, priority=priority),
+            # Idle flushes keep alerts flowing while the write buffer is not full yet
+            Stage('save', save, maxsize=size,
+                  idle_timeout=settings.STAGE_SAVE_IDLE_SECONDS, on_idle=flush, on_close=finish_saving),
+            Stage('notify', notify, maxsize=size, priority=priority),
+        ]
+
+    def _process_single_item(self, item, deduped=False):
+        """
+        Dedup -> fetch content -> analyze -> queue save (notify on insert) for one item.
+        deduped=True skips the per-item duplicate check (already done by _filter_new_items).
+        Callers must call flush_writes() once they are done queueing items.
+        """
         agency_id = item['agency']
         title = item['title']
         link = item['link']
         
         # Deduplication (use sanction-specific check for sanction agencies)
-        if agency_id in ['FSS_SANCTION', 'FSS_MGMT_NOTICE']:
-            if self._is_sanction_duplicate(link, agency_id):
-                logger.debug(f"Skipping duplicate sanction: {title[:30]}...")
-                return
-        else:
-            if self._is_duplicate(link):
+        if not deduped:
+            if agency_id in SANCTION_AGENCIES:
+                if self._is_sanction_duplicate(link, agency_id):
+                    logger.debug(f"Skipping duplicate sanction: {title[:30]}...")
+                    return
+            elif self._is_duplicate(link):
                 logger.debug(f"Skipping duplicate: {title[:30]}...")
                 return
 
         logger.info(f"Processing: [{agency_id}] {title}")
 
-        # Content Fetching
-        agency_config = self.agency_map.get(agency_id)
-        content = None
-        if agency_config:
-            content = self.scraper.fetch_content(link, agency_config)
-            if content:
-                item['content'] = content
-            else:
-                content = title + "\n" + item.get('description', '')
-
         # Analysis
         analysis_result = None
         if self.analyzer:
+            job = self._analysis_job(item)
             try:
                 analysis_result = self.analyzer.process(
-                    {'title': title, 'content': content, 'description': item.get('description', '')},
-                    agency_config.get('name', agency_id) if agency_config else agency_id,
-                    category=item.get('category', 'press_release')
+                    job['article'], job['agency_name'],
+                    category=job['category'], content_loader=job['content_loader']
                 )
-                item['analysis_result'] = analysis_result
             except Exception as e:
                 logger.error(f"Analysis failed: {e}")
 
-        # Save
-        item['analysis_result'] = analysis_result # Ensure it's set
+        # Save (buffered; notification fires once the row is actually inserted)
+        item['analysis_result'] = analysis_result
         self._save_to_db(item)
 
-        # Notify
-        if self.notifier and analysis_result and analysis_result.get('analysis_status') == 'ANALYZED':
-            a_name = agency_config.get('name', agency_id) if agency_config else agency_id
-            logger.info("  > Sending Notification...")
-            try:
-                self.notifier.format_and_send(a_name, title, link, analysis_result)
-            except Exception as e:
-                logger.error(f"Notification failed: {e}")
+    def _analysis_job(self, item):
+        """Builds an HybridAnalyzer.process_many job for a collected item."""
+        agency_id = item['agency']
+        title = item['title']
+        link = item['link']
+        agency_config = self.agency_map.get(agency_id)
+
+        # Content Fetching (lazy: only when the analyzer sends the item to Tier 2;
+        # bodies of skipped items are filled later by scripts/admin/fill_missing_content.py)
+        def load_content():
+            content = None
+            if agency_config:
+                content = self.content_pool.fetch(link, agency_config)
+            if content:
+                item['content'] = content
+                return content
+            return title + "\n" + item.get('description', '')
+
+        return {
+            'ref': item,
+            'article': {'title': title, 'content': item.get('content'), 'description': item.get('description', '')},
+            'agency_name': agency_config.get('name', agency_id) if agency_config else agency_id,
+            'category': item.get('category', 'press_release'),
+            'content_loader': load_content,
+        }
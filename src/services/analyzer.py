@@ -9,7 +9,10 @@ import os
 import json
 import time
 import logging
-from typing import Dict, Any, Optional
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Optional, Tuple
 from dotenv import load_dotenv
 import google.generativeai as genai
 from google.generativeai.types import GenerationConfig
@@ -23,8 +26,20 @@ from config.settings import (
     MODEL_ANALYZER_ID, 
     MODEL_ANALYZER_FALLBACK,
     IMPORTANCE_THRESHOLD,
-    API_CALL_DELAY
+    ANALYZER_MAX_WORKERS,
+    FILTER_BATCH_TOKEN_BUDGET,
+    FILTER_BATCH_MAX_ITEMS,
+    LLM_CACHE_ENABLED,
+    RULE_ANALYZE_CATEGORIES,
+    MODEL_ROUTER_PRIMARY_RETRIES,
+    PRECLASSIFIER_SKIP_POSITIVES
 )
+from src.services.llm_limiter import get_llm_limiter, estimate_tokens
+from src.services.llm_cache import LLMResponseCache
+from src.services.safeguards import get_safeguard_matcher
+from src.services.model_router import ModelRouter
+from src.services.condenser import get_condenser
+from src.services.preclassifier import load_preclassifier, tier1_description
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -32,11 +47,54 @@ logger = logging.getLogger(__name__)
 
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
+# Prompt template versions (part of the LLM cache key).
+# Bump when a prompt's wording or output format changes to invalidate cached responses.
+FILTER_PROMPT_VERSION = "filter-v1"
+FILTER_BATCH_PROMPT_VERSION = "filter-batch-v1"
+ANALYZER_PROMPT_VERSION = "analyze-v1"
+
+# Rule-first routing outcomes (see HybridAnalyzer.route)
+ROUTE_ANALYZE = "rule_analyze"      # rules guarantee Tier 2: skip the gatekeeper call
+ROUTE_SKIP = "rule_skip"            # rules say routine: SKIPPED without any model call
+ROUTE_GATEKEEPER = "gatekeeper"     # undecided: Tier 1 decides
+
+# Tier 1 scoring rubric, shared by the single and batched gatekeeper prompts
+GATEKEEPER_GUIDELINES = """
+        **Scoring Guidelines (Based on 'Banking Business Impact' & 'Actionability')**:
+        
+        **High (Score 4-5): Immediate Strategy Revision / ALCO Agenda (Must Act)**
+        *Criteria: If the news requires an ALCO or Risk Committee meeting tomorrow, or impacts the following:*
+        1. **4 Pillars**:
+           - **Loan (여신)**: DSR/LTV changes, Provisioning rules, Underwriting guidelines.
+           - **Deposit (수신)**: Rate disclosure rules, liquidity coverage requirements, funding competition limits.
+           - **Compliance (준법)**: Bank Act amendments, Internal Control (Book of Responsibilities), Consumer Protection Act.
+           - **Capital (재무)**: BIS ratio rules, Dividend restrictions, LCR/NSFR changes.
+        2. **Market/Biz Impact**:
+           - **Macro**: BOK Base Rate decisions, Major liquidity supply.
+           - **New Biz**: Permission for new ventures (Platform, non-financial), Restrictions on core earnings (Interest income).
+           - **Spillover**: Major crises in securities/insurance sectors affecting bank subsidiaries or stability.
+        
+        **Moderate (Score 3): Monitoring / Watch List**
+        *Criteria: General market monitoring or indirect references.*
+        - **Market**: Exchange rate/Interest rate trends (without policy shifts).
+        - **Indirect**: Regulations for other sectors (Card/Insurance) with minor spillover to banks.
+        - **Reports**: Household debt stats (monthly), Delinquency rate trends (if not crisis level).
+
+        **Low (Score 1-2): Routine / Irrelevant**
+        *Criteria: Administrative or unrelated.*
+        - **Routine**: Bond auctions, weekly schedules, holiday notices.
+        - **Admin**: Personnel news, Awards, MOUs without binding policy changes.
+        - **Irrelevant**: Exclusive issues of other sectors (Savings banks, Pawn shops) with zero bank impact."""
+
 
 class HybridAnalyzer:
     """2-Tier Hybrid Analyzer with Gatekeeper + Analyst pipeline."""
     
-    def __init__(self):
+    def __init__(self, use_cache: Optional[bool] = None):
+        """
+        use_cache: read/write the on-disk response cache. Defaults to LLM_CACHE_ENABLED unless
+        the LLM_CACHE_BYPASS env var is set; pass False for intentional re-scoring.
+        """
         if not GEMINI_API_KEY:
             raise ValueError("GEMINI_API_KEY is not set in .env")
         
@@ -46,13 +104,47 @@ class HybridAnalyzer:
         self.analyzer_model = MODEL_ANALYZER_ID
         self.analyzer_fallback = MODEL_ANALYZER_FALLBACK
         self.importance_threshold = IMPORTANCE_THRESHOLD
+        # Shared RPM/TPM budget (replaces fixed sleeps between calls)
+        self.limiter = get_llm_limiter()
+        # Compiled keyword rules (one automaton, hot-reloaded when the JSON changes)
+        self.safeguards = get_safeguard_matcher()
+        # Tier-2 input condensation (replaces a fixed 3000-char cut)
+        self.condenser = get_condenser()
+        # Tier-2 model selection: circuit breaker + optional hedging, per-model latency percentiles
+        self.router = ModelRouter(self.analyzer_model, self.analyzer_fallback)
+        # Offline-trained local classifier that answers obvious cases without a gatekeeper call
+        self.preclassifier = load_preclassifier()
+        # Articles per routing outcome, to measure API calls saved by rules
+        self.route_stats = Counter()
+        self._stats_lock = threading.Lock()
+
+        if use_cache is None:
+            use_cache = LLM_CACHE_ENABLED and not os.getenv("LLM_CACHE_BYPASS")
+        self.cache = None
+        if use_cache:
+            try:
+                self.cache = LLMResponseCache()
+            except Exception as e:
+                logger.warning(f"LLM cache unavailable, continuing without it: {e}")
         
-    def _call_api(self, model_name: str, prompt: str, max_retries: int = 3) -> Optional[str]:
-        """Call Gemini API with retry logic."""
+    def _call_api(self, model_name: str, prompt: str, max_retries: int = 3,
+                  prompt_version: Optional[str] = None, check_cache: bool = True) -> Optional[str]:
+        """
+        Call Gemini API with retry logic, paced by the shared per-model limiter.
+        With a prompt_version, responses are served from / stored in the LLM cache
+        (check_cache=False skips the lookup but still stores the response).
+        """
+        if self.cache and prompt_version and check_cache:
+            cached = self.cache.get(model_name, prompt_version, prompt)
+            if cached is not None:
+                return cached
+
         base_delay = 10
         model = genai.GenerativeModel(model_name)
+        prompt_tokens = estimate_tokens(prompt)
         
         for attempt in range(max_retries):
+            self.limiter.acquire(model_name, prompt_tokens)
             try:
                 response = model.generate_content(
                     prompt,
@@ -62,6 +154,8 @@ class HybridAnalyzer:
                 )
                 
                 if response.text:
+                    if self.cache and prompt_version:
+                        self.cache.put(model_name, prompt_version, prompt, response.text)
                     return response.text
                 return None
                 
@@ -70,7 +164,8 @@ class HybridAnalyzer:
                 if "429" in error_str or "RESOURCE_EXHAUSTED" in error_str:
                     delay = base_delay * (attempt + 1)
                     logger.warning(f"Rate Limit hit. Retrying in {delay}s... (Attempt {attempt+1}/{max_retries})")
-                    time.sleep(delay)
+                    # Cool the model down for every worker, not just this one
+                    self.limiter.backoff(model_name, delay)
                 elif "404" in error_str or "NOT_FOUND" in error_str:
                     logger.error(f"Model {model_name} not found")
                     # Fallback instantly if model name is wrong
@@ -79,7 +174,8 @@ class HybridAnalyzer:
                     logger.error(f"API Error ({model_name}): {error_str[:200]}")
                     # If it's a critical error, maybe don't retry immediately or handle differently
                     # But for now, we try/catch loop
-                    time.sleep(5)
+                    if attempt < max_retries - 1:
+                        time.sleep(5)
         
         logger.error("Failed after max retries")
         return None
@@ -98,32 +194,7 @@ class HybridAnalyzer:
         - Source: {agency_name}
         - Title: {title}
         - Summary: {description}
-        
-        **Scoring Guidelines (Based on 'Banking Business Impact' & 'Actionability')**:
-        
-        **High (Score 4-5): Immediate Strategy Revision / ALCO Agenda (Must Act)**
-        *Criteria: If the news requires an ALCO or Risk Committee meeting tomorrow, or impacts the following:*
-        1. **4 Pillars**:
-           - **Loan (여신)**: DSR/LTV changes, Provisioning rules, Underwriting guidelines.
-           - **Deposit (수신)**: Rate disclosure rules, liquidity coverage requirements, funding competition limits.
-           - **Compliance (준법)**: Bank Act amendments, Internal Control (Book of Responsibilities), Consumer Protection Act.
-           - **Capital (재무)**: BIS ratio rules, Dividend restrictions, LCR/NSFR changes.
-        2. **Market/Biz Impact**:
-           - **Macro**: BOK Base Rate decisions, Major liquidity supply.
-           - **New Biz**: Permission for new ventures (Platform, non-financial), Restrictions on core earnings (Interest income).
-           - **Spillover**: Major crises in securities/insurance sectors affecting bank subsidiaries or stability.
-        
-        **Moderate (Score 3): Monitoring / Watch List**
-        *Criteria: General market monitoring or indirect references.*
-        - **Market**: Exchange rate/Interest rate trends (without policy shifts).
-        - **Indirect**: Regulations for other sectors (Card/Insurance) with minor spillover to banks.
-        - **Reports**: Household debt stats (monthly), Delinquency rate trends (if not crisis level).
-
-        **Low (Score 1-2): Routine / Irrelevant**
-        *Criteria: Administrative or unrelated.*
-        - **Routine**: Bond auctions, weekly schedules, holiday notices.
-        - **Admin**: Personnel news, Awards, MOUs without binding policy changes.
-        - **Irrelevant**: Exclusive issues of other sectors (Savings banks, Pawn shops) with zero bank impact.
+{GATEKEEPER_GUIDELINES}
         
         **Output** (JSON only):
         {{
@@ -132,21 +203,128 @@ class HybridAnalyzer:
         }}
         """
         
-        response_text = self._call_api(self.filter_model, prompt)
+        response_text = self._call_api(self.filter_model, prompt, prompt_version=FILTER_PROMPT_VERSION)
         
         if response_text:
             try:
                 return json.loads(response_text)
             except json.JSONDecodeError:
                 logger.error(f"Failed to parse filter response: {response_text[:100]}")
+                self._discard_cached(self.filter_model, FILTER_PROMPT_VERSION, prompt)
                 return None
         return None
 
+    def filter_batch(self, entries: List[Tuple[str, str, str]], max_workers: int = None) -> List[Optional[Dict[str, Any]]]:
+        """
+        Tier 1 for many articles at once.
+        Scores (agency_name, title, summary) tuples with one model call per chunk; chunks are
+        sized by FILTER_BATCH_TOKEN_BUDGET / FILTER_BATCH_MAX_ITEMS. Results are aligned with
+        `entries`; items missing from or invalid in a batch response fall back to filter().
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(entries)
+        chunks = self._chunk_filter_entries(entries)
+        if not chunks:
+            return results
+
+        with ThreadPoolExecutor(max_workers=max_workers or ANALYZER_MAX_WORKERS, thread_name_prefix='gatekeeper') as executor:
+            for chunk_results in executor.map(lambda chunk: self._filter_chunk(chunk, entries), chunks):
+                for index, result in chunk_results.items():
+                    results[index] = result
+
+        logger.info(f"Tier 1 batch: {len(entries)} articles in {len(chunks)} calls")
+        return results
+
+    def _chunk_filter_entries(self, entries: List[Tuple[str, str, str]]) -> List[List[int]]:
+        chunks, current, current_tokens = [], [], 0
+        for index, (agency_name, title, summary) in enumerate(entries):
+            tokens = estimate_tokens(f"{agency_name} {title} {summary[:200]}") + 20
+            if current and (current_tokens + tokens > FILTER_BATCH_TOKEN_BUDGET or len(current) >= FILTER_BATCH_MAX_ITEMS):
+                chunks.append(current)
+                current, current_tokens = [], 0
+            current.append(index)
+            current_tokens += tokens
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def _filter_chunk(self, indices: List[int], entries: List[Tuple[str, str, str]]) -> Dict[int, Optional[Dict[str, Any]]]:
+        if len(indices) == 1:
+            agency_name, title, summary = entries[indices[0]]
+            return {indices[0]: self.filter(title, summary, agency_name)}
+
+        items = [
+            {"id": index, "source": entries[index][0], "title": entries[index][1], "summary": entries[index][2][:200]}
+            for index in indices
+        ]
+        prompt = f"""
+        You are a news relevance filter for a Korean commercial bank's risk management team.
+        
+        **Task**: For EACH news item below, determine if it is relevant to "Korean commercial banks' risk management" and assign an importance score. Score every item independently.
+        
+        **Input** (JSON array, one object per item):
+        {json.dumps(items, ensure_ascii=False)}
+{GATEKEEPER_GUIDELINES}
+        
+        **Output** (JSON array only, exactly one object per input item, same "id"):
+        [
+            {{"id": integer, "is_relevant": boolean, "importance_score": integer (1-5)}}
+        ]
+        """
+
+        parsed = self._parse_batch_filter(
+            self._call_api(self.filter_model, prompt, prompt_version=FILTER_BATCH_PROMPT_VERSION), indices
+        )
+        if not parsed:
+            self._discard_cached(self.filter_model, FILTER_BATCH_PROMPT_VERSION, prompt)
+
+        # Fall back to single-item calls for anything the batch response did not cover
+        missing = [index for index in indices if index not in parsed]
+        if missing:
+            logger.warning(f"Batch filter response incomplete ({len(missing)}/{len(indices)} missing). Falling back to single calls.")
+            for index in missing:
+                agency_name, title, summary = entries[index]
+                parsed[index] = self.filter(title, summary, agency_name)
+        return parsed
+
+    def _parse_batch_filter(self, response_text: Optional[str], indices: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Validates a batch gatekeeper response; returns only well-formed entries keyed by input id."""
+        if not response_text:
+            return {}
+        try:
+            data = json.loads(response_text.replace('```json', '').replace('```', '').strip())
+        except json.JSONDecodeError:
+            logger.error(f"Failed to parse batch filter response: {response_text[:100]}")
+            return {}
+        if isinstance(data, dict):
+            data = data.get('results') or data.get('items') or []
+        if not isinstance(data, list):
+            return {}
+
+        wanted = set(indices)
+        parsed = {}
+        for entry in data:
+            try:
+                index = int(entry['id'])
+                score = int(entry['importance_score'])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if index not in wanted or not 0 <= score <= 5:
+                continue
+            parsed[index] = {
+                "is_relevant": bool(entry.get('is_relevant', score >= 1)),
+                "importance_score": score
+            }
+        return parsed
+
     def analyze(self, title: str, full_content: str, agency_name: str) -> Optional[Dict[str, Any]]:
         """
         Tier 2: Analyst - Deep analysis for important news.
-        Uses full article content.
+        Uses the article content condensed to CONDENSER_TOKEN_BUDGET (boilerplate removed,
+        most relevant paragraphs kept).
         """
+        content, condensed = self.condenser.condense(full_content or '', title, agency_name)
+        logger.debug(f"Condensed content: {condensed['input_tokens']} -> {condensed['output_tokens']} tokens "
+                     f"({condensed['kept']}/{condensed['paragraphs']} paragraphs)")
         prompt = f"""
         # Role
         당신은 시중은행 전략기획부(CSO) 및 리스크관리부(CRO) 소속 수석 분석가입니다. 
@@ -187,16 +365,25 @@ class HybridAnalyzer:
         Title: {title}
         Source: {agency_name}
         Content:
-        {full_content[:3000]}
+        {content}
         """
         
-        # Try primary model
-        response_text = self._call_api(self.analyzer_model, prompt)
-        
-        # Fallback if primary fails
+        # Cached primary answers skip the router (and stay out of its latency stats)
+        used_model = self.analyzer_model
+        response_text = None
+        if self.cache:
+            response_text = self.cache.get(self.analyzer_model, ANALYZER_PROMPT_VERSION, prompt)
+
+        # Primary behind a circuit breaker, fallback on failure (or hedged after the primary's p95)
         if not response_text:
-            logger.warning(f"Primary model {self.analyzer_model} failed. Trying fallback {self.analyzer_fallback}")
-            response_text = self._call_api(self.analyzer_fallback, prompt)
+            response_text, used_model = self.router.call(
+                lambda model: self._call_api(
+                    model, prompt,
+                    max_retries=MODEL_ROUTER_PRIMARY_RETRIES if model == self.analyzer_model else 3,
+                    prompt_version=ANALYZER_PROMPT_VERSION,
+                    check_cache=model != self.analyzer_model
+                )
+            )
         
         if response_text:
             try:
@@ -213,100 +400,174 @@ class HybridAnalyzer:
                     "risk_score": data["importance"]["score"],
                     "risk_tags": data["classification"]["risk_tags"],
                     "pillars": data["classification"]["pillars"],
-                    "analyzed_by": self.analyzer_model # Keep track of which model was used
+                    "analyzed_by": used_model # Keep track of which model was used
                 }
             except (json.JSONDecodeError, KeyError) as e:
                 logger.error(f"Failed to parse analysis response: {e}, Text: {response_text[:100]}")
+                self._discard_cached(used_model, ANALYZER_PROMPT_VERSION, prompt)
                 return None
         return None
 
-    def _is_personnel_announcement(self, title: str, agency_name: str) -> bool:
-        """
-        Check if the article is a personnel announcement from key agencies.
-        Personnel announcements from any agency are HIGH importance.
-        """
-        # Key agencies - ALL agencies we track
-        key_agencies = ['금융감독원', '금융위원회', '기획재정부', '한국은행', 'FSS', 'FSC', 'MOEF', 'BOK']
-        
-        # Personnel-related keywords (expanded)
-        personnel_keywords = [
-            '인사', '인사발령', '인사이동', '임명', '취임', '발령', 
-            '임원', '임원 인사', '부원장', '원장', '국장', '실장', '부장', '팀장', '부서장',
-            '승진', '전보', '보직', '개편', '조직개편', '조직 개편'
-        ]
-        
-        # Check if agency is relevant
-        is_key_agency = any(agency in agency_name for agency in key_agencies)
-        
-        # Check if title contains personnel keywords
-        has_personnel_keyword = any(keyword in title for keyword in personnel_keywords)
-        
-        return is_key_agency and has_personnel_keyword
+    def _discard_cached(self, model_name: str, prompt_version: str, prompt: str):
+        if self.cache:
+            self.cache.discard(model_name, prompt_version, prompt)
 
-    def _apply_keyword_safeguards(self, title: str, current_score: int) -> int:
+    def _apply_keyword_safeguards(self, title: str, current_score: int, body: Optional[str] = None) -> int:
         """
         Apply rule-based safeguards to ensure important keywords are not undervalued by AI.
-        Reads rules from config/safeguard_keywords.json.
+        Rules come from config/safeguard_keywords.json, compiled into one automaton.
+        Title matches always count; body matches only where the tier's "match_body" allows them.
         """
         try:
-            config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'config', 'safeguard_keywords.json')
-            if not os.path.exists(config_path):
-                return current_score
-                
-            with open(config_path, 'r', encoding='utf-8') as f:
-                safeguards = json.load(f)
-            
-            new_score = current_score
-            
-            # Check High Importance (Score 5)
-            for keyword in safeguards.get('high_importance', {}).get('keywords', []):
-                if keyword in title:
-                    if new_score < 5:
-                        logger.info(f"🛡️ Safeguard triggered (High): '{keyword}' found. Boosting score {current_score} -> 5")
-                        return 5
-            
-            # Check Medium Importance (Score 4)
-            for keyword in safeguards.get('medium_importance', {}).get('keywords', []):
-                if keyword in title:
-                    if new_score < 4:
-                        logger.info(f"🛡️ Safeguard triggered (Medium): '{keyword}' found. Boosting score {current_score} -> 4")
-                        new_score = 4
-                        
-            return new_score
+            best = None
+            for m in self.safeguards.match(title, body):
+                if m['tier'] not in ('high_importance', 'medium_importance') or not m['score']:
+                    continue
+                if m['field'] == 'body' and not self.safeguards.counts_in_body(m['tier'], m['keyword']):
+                    continue
+                if best is None or m['score'] > best['score']:
+                    best = m
+
+            if best and best['score'] > current_score:
+                level = 'High' if best['tier'] == 'high_importance' else 'Medium'
+                logger.info(f"🛡️ Safeguard triggered ({level}): '{best['keyword']}' found in {best['field']}. "
+                            f"Boosting score {current_score} -> {best['score']}")
+                return best['score']
+            return current_score
             
         except Exception as e:
             logger.error(f"Error applying safeguards: {e}")
             return current_score
 
-    def process(self, article: Dict[str, Any], agency_name: str, category: str = 'press_release') -> Dict[str, Any]:
+    def route(self, title: str, agency_name: str, category: str = 'press_release') -> Tuple[str, int, str]:
+        """
+        Rule-first routing before any model call.
+
+        Returns (route, importance_score, reason):
+        - ROUTE_ANALYZE: a safeguard keyword or the category (RULE_ANALYZE_CATEGORIES)
+          already guarantees Tier 2.
+        - ROUTE_SKIP: a "routine" keyword (bond auctions, weekly schedules...) and nothing else fired.
+        - ROUTE_GATEKEEPER: no rule decides; Tier 1 scores the article.
+        """
+        if category in RULE_ANALYZE_CATEGORIES:
+            return ROUTE_ANALYZE, RULE_ANALYZE_CATEGORIES[category], f"category:{category}"
+
+        matches = self.safeguards.match(title)
+        boosting = [m for m in matches if m['tier'] in ('high_importance', 'medium_importance') and m['score']]
+        if boosting:
+            best = max(boosting, key=lambda m: m['score'])
+            if best['score'] >= self.importance_threshold:
+                return ROUTE_ANALYZE, best['score'], f"keyword:{best['keyword']}"
+
+        routine = [m for m in matches if m['tier'] == 'routine']
+        if routine and not boosting:
+            score = self.safeguards.rule('routine').get('score', 1)
+            return ROUTE_SKIP, score, f"routine:{routine[0]['keyword']}"
+
+        return ROUTE_GATEKEEPER, 0, ""
+
+    def _local_filter(self, title: str, agency_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Gatekeeper substitute from the local pre-classifier, or None when it is not loaded
+        or not confident (the article then goes to Gemini). Only confident negatives are
+        used unless PRECLASSIFIER_SKIP_POSITIVES is set.
+        """
+        if not self.preclassifier:
+            return None
+        label, probability = self.preclassifier.predict(agency_name, title)
+        if label is None or (label and not PRECLASSIFIER_SKIP_POSITIVES):
+            return None
+        return {
+            "is_relevant": label,
+            "importance_score": self.importance_threshold if label else 1,
+            "local_probability": round(probability, 4)
+        }
+
+    def _count_route(self, route: str):
+        with self._stats_lock:
+            self.route_stats[route] += 1
+
+    @staticmethod
+    def _description(article: Dict[str, Any]) -> str:
+        return tier1_description(article)
+
+    def process(self, article: Dict[str, Any], agency_name: str, category: str = 'press_release',
+                content_loader: Optional[Callable[[], Optional[str]]] = None,
+                filter_result: Optional[Dict[str, Any]] = None, filtered: bool = False) -> Dict[str, Any]:
         """
         Main pipeline: Filter -> Analyze (if important)
         
+        content_loader: optional callable returning the article body. It is only called
+        when the article reaches Tier 2, so bodies of filtered-out articles are never fetched.
+        filtered=True means Tier 1 already ran (e.g. via filter_batch) and filter_result
+        holds its output (None if it failed), so no gatekeeper call is made here.
+        Rule-first routing (route()) runs before all of this and can skip Tier 1 entirely.
+        
         Returns combined result with filter and analysis data.
         """
+        result = self.triage(article, agency_name, category, filter_result=filter_result, filtered=filtered)
+        if self.needs_analysis(result):
+            result = self.deep_analyze(result, article, agency_name, content_loader=content_loader)
+        return result
+
+    @staticmethod
+    def needs_analysis(result: Dict[str, Any]) -> bool:
+        """True for triage() results that still have to go through Tier 2."""
+        return 'analysis_status' not in result
+
+    def triage(self, article: Dict[str, Any], agency_name: str, category: str = 'press_release',
+               filter_result: Optional[Dict[str, Any]] = None, filtered: bool = False) -> Dict[str, Any]:
+        """
+        Tier 1 half of process(): routing rules, gatekeeper (or its local/batched substitute)
+        and keyword safeguards. Articles that stop here come back with analysis_status
+        SKIPPED; the rest have no analysis_status yet and go to deep_analyze().
+        """
         title = article.get('title', '')
-        description = article.get('description') or article.get('content', '')[:200] or title
-        full_content = article.get('content') or title
+        description = self._description(article)
         
         # Default values
         is_relevant = False
         importance_score = 0
         filter_status = "OK"
 
-        # Step 1: Gatekeeper
-        filter_result = self.filter(title, description, agency_name)
-        time.sleep(API_CALL_DELAY)  # Rate limit protection
-        
-        if filter_result:
-            is_relevant = filter_result.get('is_relevant', False)
-            importance_score = filter_result.get('importance_score', 0)
+        # Step 0: Rule-first routing
+        route, rule_score, route_reason = self.route(title, agency_name, category)
+        self._count_route(route)
+
+        if route == ROUTE_SKIP:
+            logger.info(f"Skipped by rule ({route_reason}): {title[:40]}")
+            return {
+                "is_relevant": False,
+                "importance_score": rule_score,
+                "filter_status": "RULE",
+                "route": route_reason,
+                "analysis_status": "SKIPPED"
+            }
+
+        # Step 1: Gatekeeper (not needed when rules already guarantee Tier 2)
+        if route == ROUTE_ANALYZE:
+            logger.info(f"Routed to Tier 2 by rule ({route_reason}): {title[:40]}")
+            is_relevant = True
+            importance_score = rule_score
+            filter_status = "RULE"
         else:
-            logger.warning(f"Filter failed for: {title[:50]}")
-            filter_status = "ERROR"
+            if not filtered:
+                filter_result = (self._local_filter(title, agency_name) or
+                                 self.filter(title, description, agency_name))
+            
+            if filter_result:
+                is_relevant = filter_result.get('is_relevant', False)
+                importance_score = filter_result.get('importance_score', 0)
+                if 'local_probability' in filter_result:
+                    filter_status = "LOCAL"
+                    self._count_route("local_classifier")
+            else:
+                logger.warning(f"Filter failed for: {title[:50]}")
+                filter_status = "ERROR"
 
         # 🛡️ Apply Keyword Safeguards (Override AI Score)
         original_score = importance_score
-        importance_score = self._apply_keyword_safeguards(title, original_score)
+        importance_score = self._apply_keyword_safeguards(title, original_score, body=article.get('content') or description)
         
         # If score was boosted, ensure it's marked as relevant
         if importance_score > original_score:
@@ -318,39 +579,127 @@ class HybridAnalyzer:
             "importance_score": importance_score,
             "filter_status": filter_status
         }
+        if route_reason:
+            result["route"] = route_reason
         
+        if not (is_relevant and importance_score >= self.importance_threshold):
+            result["analysis_status"] = "SKIPPED"
+            logger.info(f"Filtered out (Score: {importance_score}, Relevant: {is_relevant}): {title[:40]}")
+        return result
+
+    def deep_analyze(self, result: Dict[str, Any], article: Dict[str, Any], agency_name: str,
+                     content_loader: Optional[Callable[[], Optional[str]]] = None) -> Dict[str, Any]:
+        """Tier 2 half of process() for a triage() result that needs analysis."""
+        title = article.get('title', '')
+        importance_score = result.get('importance_score', 0)
+
         # Step 2: Analyst (only for important news)
-        # Check if score is high enough (Threshold is usually 3)
-        if is_relevant and importance_score >= self.importance_threshold:
-            logger.info(f"Proceeding to Tier 2 analysis (Score: {importance_score}): {title[:40]}...")
-            
-            analysis = self.analyze(title, full_content, agency_name)
-            time.sleep(API_CALL_DELAY)  # Rate limit protection
+        logger.info(f"Proceeding to Tier 2 analysis (Score: {importance_score}): {title[:40]}...")
+        
+        full_content = article.get('content')
+        if not full_content and content_loader:
+            full_content = content_loader()
+        full_content = full_content or title
+
+        analysis = self.analyze(title, full_content, agency_name)
+        
+        if analysis:
+            result.update(analysis)
+            result["analysis_status"] = "ANALYZED"
             
-            if analysis:
-                result.update(analysis)
-                result["analysis_status"] = "ANALYZED"
-                
-                # If safeguard boosted complexity, ensure risk_score matches
-                if result.get("risk_score", 0) < importance_score:
-                    result["risk_score"] = importance_score
-                    if importance_score >= 5:
-                        result["risk_level"] = "High"
-                    elif importance_score == 4:
-                         # Don't downgrade High to Medium, but upgrade Low to Medium
-                        if result.get("risk_level") == "Low":
-                            result["risk_level"] = "Medium"
-
-                logger.info(f"Analyzed successfully (Model: {self.analyzer_model}): {title[:40]}")
-            else:
-                result["analysis_status"] = "ANALYSIS_FAILED"
-                logger.warning(f"Analysis failed: {title[:40]}")
+            # If safeguard boosted complexity, ensure risk_score matches
+            if result.get("risk_score", 0) < importance_score:
+                result["risk_score"] = importance_score
+                if importance_score >= 5:
+                    result["risk_level"] = "High"
+                elif importance_score == 4:
+                     # Don't downgrade High to Medium, but upgrade Low to Medium
+                    if result.get("risk_level") == "Low":
+                        result["risk_level"] = "Medium"
+
+            logger.info(f"Analyzed successfully (Model: {result.get('analyzed_by')}): {title[:40]}")
         else:
-            result["analysis_status"] = "SKIPPED"
-            logger.info(f"Filtered out (Score: {importance_score}, Relevant: {is_relevant}): {title[:40]}")
+            result["analysis_status"] = "ANALYSIS_FAILED"
+            logger.warning(f"Analysis failed: {title[:40]}")
         
         return result
 
+    def triage_many(self, jobs: List[Dict[str, Any]], max_workers: int = None) -> List[Optional[Dict[str, Any]]]:
+        """
+        triage() for many jobs (see process_many for the job format) with batched Tier 1:
+        rules and the local pre-classifier first, one gatekeeper call per chunk for the rest.
+        Results are aligned with jobs (None where triage raised).
+        """
+        filter_results = [None] * len(jobs)
+        filtered = [False] * len(jobs)
+        gatekeeper_indices = [
+            i for i, job in enumerate(jobs)
+            if self.route(job['article'].get('title', ''), job['agency_name'], job.get('category', 'press_release'))[0] == ROUTE_GATEKEEPER
+        ]
+        # Confident local predictions need no gatekeeper call either
+        api_indices = []
+        for i in gatekeeper_indices:
+            job = jobs[i]
+            local_result = self._local_filter(job['article'].get('title', ''), job['agency_name'])
+            if local_result:
+                filter_results[i] = local_result
+                filtered[i] = True
+            else:
+                api_indices.append(i)
+        batch_results = self.filter_batch(
+            [(jobs[i]['agency_name'], jobs[i]['article'].get('title', ''), self._description(jobs[i]['article'])) for i in api_indices],
+            max_workers=max_workers
+        )
+        for i, filter_result in zip(api_indices, batch_results):
+            filter_results[i] = filter_result
+            filtered[i] = True
+
+        results = []
+        for job, filter_result, was_filtered in zip(jobs, filter_results, filtered):
+            try:
+                results.append(self.triage(
+                    job['article'], job['agency_name'], job.get('category', 'press_release'),
+                    filter_result=filter_result, filtered=was_filtered
+                ))
+            except Exception as e:
+                logger.error(f"Triage failed: {e}")
+                results.append(None)
+        return results
+
+    def process_many(self, jobs: Iterable[Dict[str, Any]], max_workers: int = None) -> Iterator[Tuple[Any, Optional[Dict[str, Any]]]]:
+        """
+        Concurrent mode: scores all articles with batched Tier 1 calls (triage_many), then
+        runs Tier 2 on a thread pool under the shared RPM/TPM budget and yields
+        (ref, result) as each one finishes (articles that stop at Tier 1 come first).
+
+        Each job is a dict with 'article', 'agency_name' and optional 'category',
+        'content_loader' and 'ref' (returned as-is to identify the job; defaults to the job).
+        result is None if processing raised.
+        """
+        max_workers = max_workers or ANALYZER_MAX_WORKERS
+        jobs = list(jobs)
+        triaged = self.triage_many(jobs, max_workers=max_workers)
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='analyze') as executor:
+            futures = {}
+            for job, result in zip(jobs, triaged):
+                if result is None or not self.needs_analysis(result):
+                    yield job.get('ref', job), result
+                    continue
+                future = executor.submit(
+                    self.deep_analyze, result, job['article'], job['agency_name'],
+                    content_loader=job.get('content_loader')
+                )
+                futures[future] = job.get('ref', job)
+
+            for future in as_completed(futures):
+                ref = futures[future]
+                try:
+                    yield ref, future.result()
+                except Exception as e:
+                    logger.error(f"Analysis failed: {e}")
+                    yield ref, None
+
 
 # Backward compatibility alias
 RegulationAnalyzer = HybridAnalyzer
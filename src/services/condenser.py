@@ -0,0 +1,137 @@
+"""
+Token-aware condensation of article bodies before Tier-2 analysis.
+
+Instead of cutting the body at a fixed character count, the condenser
+1. drops boilerplate lines (contacts, release times, attachments) using the
+   common and per-agency patterns in config/boilerplate_patterns.json,
+2. groups the remaining lines into paragraphs and ranks them by safeguard
+   keyword hits and title-term overlap per token,
+3. packs the best paragraphs into CONDENSER_TOKEN_BUDGET and emits them in
+   their original order.
+"""
+
+import json
+import logging
+import math
+import os
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from config import settings
+from src.services.llm_limiter import estimate_tokens
+from src.services.safeguards import get_safeguard_matcher
+
+logger = logging.getLogger(__name__)
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'config', 'boilerplate_patterns.json')
+
+# Lines starting with these markers open a new paragraph (report-style bullets, numbering)
+PARAGRAPH_START = re.compile(r'^\s*([□■○●◦◎▶▷◇◆▣※]|[ⅠⅡⅢⅣⅤⅥⅦⅧⅨⅩ]\.?|\d{1,2}[.)]|[가-하]\.|\(\d{1,2}\)|<|\[)')
+TERM_PATTERN = re.compile(r'[가-힣A-Za-z0-9]{2,}')
+
+
+class ContentCondenser:
+    def __init__(self, path: str = CONFIG_PATH, token_budget: int = None):
+        self.token_budget = token_budget or settings.CONDENSER_TOKEN_BUDGET
+        self.safeguards = get_safeguard_matcher()
+        self.stats = Counter()
+        self._lock = threading.Lock()
+
+        self._common: List[re.Pattern] = []
+        self._agencies: Dict[str, List[re.Pattern]] = {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                patterns = json.load(f)
+            self._common = [re.compile(p) for p in patterns.get('common', [])]
+            self._agencies = {
+                agency: [re.compile(p) for p in agency_patterns]
+                for agency, agency_patterns in patterns.get('agencies', {}).items()
+            }
+        except Exception as e:
+            logger.error(f"Error loading boilerplate patterns from {path}: {e}")
+
+    def _boilerplate_for(self, agency_name: str) -> List[re.Pattern]:
+        patterns = list(self._common)
+        for agency, agency_patterns in self._agencies.items():
+            if agency in agency_name:
+                patterns.extend(agency_patterns)
+        return patterns
+
+    def _paragraphs(self, text: str, agency_name: str) -> List[str]:
+        """Boilerplate-free paragraphs, rebuilt from the newline-separated text the scraper emits."""
+        boilerplate = self._boilerplate_for(agency_name)
+        paragraphs: List[List[str]] = []
+        for line in text.splitlines():
+            line = line.strip()
+            if not line or any(p.search(line) for p in boilerplate):
+                continue
+            current = paragraphs[-1] if paragraphs else None
+            if (current is None or PARAGRAPH_START.match(line) or
+                    sum(len(l) for l in current) >= settings.CONDENSER_MAX_PARAGRAPH_CHARS):
+                paragraphs.append([line])
+            else:
+                current.append(line)
+        return [' '.join(lines) for lines in paragraphs]
+
+    def _score(self, paragraph: str, index: int, title_terms: set) -> float:
+        keyword_score = 0
+        for m in self.safeguards.match(paragraph):
+            if m['tier'] in ('high_importance', 'medium_importance') and m['score']:
+                keyword_score += m['score']
+        overlap = len(title_terms & set(TERM_PATTERN.findall(paragraph)))
+        density = (keyword_score + 2 * overlap) / math.sqrt(max(estimate_tokens(paragraph), 1))
+        # The lead paragraphs of a release usually state the decision itself
+        lead_bonus = 1.0 / (index + 1)
+        return density + lead_bonus
+
+    def condense(self, text: str, title: str = '', agency_name: str = '') -> Tuple[str, Dict[str, int]]:
+        """Returns (condensed text, {'input_tokens', 'output_tokens', 'paragraphs', 'kept'})."""
+        input_tokens = estimate_tokens(text)
+        paragraphs = self._paragraphs(text or '', agency_name)
+        costs = [estimate_tokens(p) for p in paragraphs]
+
+        if sum(costs) <= self.token_budget:
+            kept = list(range(len(paragraphs)))
+        else:
+            title_terms = set(TERM_PATTERN.findall(title or ''))
+            ranked = sorted(range(len(paragraphs)),
+                            key=lambda i: self._score(paragraphs[i], i, title_terms), reverse=True)
+            kept, used = [], 0
+            for i in ranked:
+                if used + costs[i] <= self.token_budget:
+                    kept.append(i)
+                    used += costs[i]
+            kept.sort()
+
+        parts = [paragraphs[i] for i in kept]
+        if not parts and paragraphs:
+            # Every paragraph is over budget on its own: keep the head of the lead paragraph
+            parts = [paragraphs[0][:self.token_budget * settings.CHARS_PER_TOKEN]]
+        condensed = '\n'.join(parts)
+
+        report = {
+            'input_tokens': input_tokens,
+            'output_tokens': estimate_tokens(condensed),
+            'paragraphs': len(paragraphs),
+            'kept': len(parts),
+        }
+        with self._lock:
+            self.stats['calls'] += 1
+            self.stats['input_tokens'] += report['input_tokens']
+            self.stats['output_tokens'] += report['output_tokens']
+        return condensed, report
+
+
+_shared_condenser: Optional[ContentCondenser] = None
+_shared_lock = threading.Lock()
+
+
+def get_condenser() -> ContentCondenser:
+    """Returns the process-wide condenser (patterns compiled once)."""
+    global _shared_condenser
+    with _shared_lock:
+        if _shared_condenser is None:
+            _shared_condenser = ContentCondenser()
+        return _shared_condenser
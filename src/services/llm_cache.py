@@ -0,0 +1,112 @@
+"""
+Persistent on-disk cache for Gemini responses.
+
+Keyed by model ID + prompt-template version + hash of the whitespace-normalized
+prompt, so re-analysis scripts and backfills do not pay again for identical calls.
+Entries expire by age and the table is trimmed to a maximum size (oldest access first).
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize(prompt: str) -> str:
+    return ' '.join(prompt.split())
+
+
+class LLMResponseCache:
+    def __init__(self, path: str = None, max_entries: int = None, max_age_days: float = None):
+        self.path = path or os.path.join(settings.STATE_DIR, 'llm_cache.sqlite')
+        self.max_entries = max_entries or settings.LLM_CACHE_MAX_ENTRIES
+        self.max_age_seconds = (max_age_days or settings.LLM_CACHE_MAX_AGE_DAYS) * 86400
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, model TEXT NOT NULL, prompt_version TEXT NOT NULL,"
+            " response TEXT NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)")
+        self._conn.commit()
+        self.evict()
+
+    @staticmethod
+    def make_key(model: str, prompt_version: str, prompt: str) -> str:
+        digest = hashlib.sha256(_normalize(prompt).encode('utf-8')).hexdigest()
+        return f"{model}:{prompt_version}:{digest}"
+
+    def get(self, model: str, prompt_version: str, prompt: str) -> Optional[str]:
+        key = self.make_key(model, prompt_version, prompt)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.max_age_seconds:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, model: str, prompt_version: str, prompt: str, response: str):
+        key = self.make_key(model, prompt_version, prompt)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, prompt_version, response, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, prompt_version, response, now, now)
+            )
+            self._conn.commit()
+            self._writes += 1
+            due = self._writes % 100 == 0
+        if due:
+            self.evict()
+
+    def discard(self, model: str, prompt_version: str, prompt: str):
+        """Removes an entry (e.g. a cached response that turned out to be unparseable)."""
+        key = self.make_key(model, prompt_version, prompt)
+        with self._lock:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def evict(self):
+        """Drops entries older than max age, then the least recently used beyond max_entries."""
+        with self._lock:
+            try:
+                self._conn.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.max_age_seconds,))
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    " SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"LLM cache eviction failed: {e}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 3) if total else 0.0,
+            'entries': size,
+        }
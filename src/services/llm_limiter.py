@@ -0,0 +1,96 @@
+"""
+Shared requests-per-minute / tokens-per-minute budget for Gemini models.
+
+All analyzer threads draw from the same per-model sliding 60s window, so many
+articles can be analyzed concurrently without tripping the API quota. A 429 puts
+the whole model into a shared cooldown instead of each thread retrying blindly.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Dict
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+WINDOW_SECONDS = 60.0
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough Gemini token estimate (Korean-heavy text runs ~2 chars per token)."""
+    if not text:
+        return 0
+    return max(1, len(text) // settings.CHARS_PER_TOKEN)
+
+
+class ModelRateLimiter:
+    def __init__(self, limits: Dict[str, Dict[str, int]] = None):
+        self.limits = limits if limits is not None else settings.MODEL_RATE_LIMITS
+        self._windows: Dict[str, deque] = {}
+        self._cooldown_until: Dict[str, float] = {}
+        self._cond = threading.Condition()
+
+    def _limits_for(self, model: str) -> Dict[str, int]:
+        return self.limits.get(model) or self.limits.get('default', {'rpm': 60, 'tpm': 1_000_000})
+
+    def acquire(self, model: str, tokens: int):
+        """Blocks until the model has room for one more request of `tokens` tokens."""
+        limits = self._limits_for(model)
+        rpm, tpm = limits['rpm'], limits['tpm']
+        # A single prompt larger than the whole TPM budget would otherwise wait forever
+        tokens = min(tokens, tpm)
+
+        with self._cond:
+            window = self._windows.setdefault(model, deque())
+            while True:
+                now = time.monotonic()
+                while window and now - window[0][0] >= WINDOW_SECONDS:
+                    window.popleft()
+
+                wait = self._cooldown_until.get(model, 0) - now
+                if wait <= 0:
+                    used_tokens = sum(t for _, t in window)
+                    if len(window) < rpm and used_tokens + tokens <= tpm:
+                        window.append((now, tokens))
+                        return
+                    # Wait until the oldest request leaves the window
+                    wait = WINDOW_SECONDS - (now - window[0][0]) if window else 0.1
+
+                self._cond.wait(timeout=max(wait, 0.05))
+
+    def backoff(self, model: str, seconds: float):
+        """Pauses every caller of `model` for `seconds` (e.g. after a 429)."""
+        with self._cond:
+            until = time.monotonic() + seconds
+            if until > self._cooldown_until.get(model, 0):
+                self._cooldown_until[model] = until
+                logger.warning(f"[LLM] {model} cooling down for {seconds:.0f}s")
+            self._cond.notify_all()
+
+    def usage(self) -> Dict[str, Dict[str, int]]:
+        """Requests and tokens used per model in the current 60s window."""
+        with self._cond:
+            now = time.monotonic()
+            return {
+                model: {
+                    'requests': sum(1 for ts, _ in window if now - ts < WINDOW_SECONDS),
+                    'tokens': sum(t for ts, t in window if now - ts < WINDOW_SECONDS),
+                }
+                for model, window in self._windows.items()
+            }
+
+
+_shared_limiter = None
+_shared_lock = threading.Lock()
+
+
+def get_llm_limiter() -> ModelRateLimiter:
+    """Returns the process-wide limiter shared by all HybridAnalyzer instances."""
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            _shared_limiter = ModelRateLimiter()
+        return _shared_limiter
@@ -0,0 +1,194 @@
+"""
+Tier-2 model routing: primary model with a circuit breaker and an optional hedged fallback.
+
+The breaker opens after MODEL_ROUTER_FAILURE_THRESHOLD consecutive primary failures and
+sends every call straight to the fallback until MODEL_ROUTER_RESET_SECONDS have passed;
+then one trial call (half-open) decides whether the primary is healthy again.
+With hedging enabled, a call still running on the primary after its observed p95
+latency is duplicated on the fallback and whichever answers first wins.
+"""
+
+import logging
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Optional, Tuple
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyTracker:
+    """Latencies of the most recent successful calls for one model."""
+
+    def __init__(self, window: int = None):
+        self._samples = deque(maxlen=window or settings.MODEL_ROUTER_LATENCY_WINDOW)
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self):
+        return len(self._samples)
+
+    def percentile(self, q: float) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        index = min(len(samples) - 1, max(0, int(round(q * (len(samples) - 1)))))
+        return samples[index]
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'count': len(self),
+            'p50': self._rounded(self.percentile(0.50)),
+            'p95': self._rounded(self.percentile(0.95)),
+            'p99': self._rounded(self.percentile(0.99)),
+        }
+
+    @staticmethod
+    def _rounded(value: Optional[float]) -> Optional[float]:
+        return round(value, 2) if value is not None else None
+
+
+class CircuitBreaker:
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = None, reset_seconds: float = None):
+        self.failure_threshold = failure_threshold or settings.MODEL_ROUTER_FAILURE_THRESHOLD
+        self.reset_seconds = reset_seconds if reset_seconds is not None else settings.MODEL_ROUTER_RESET_SECONDS
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """True if a call may go to the protected model right now."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_seconds:
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                # Exactly one trial call probes the model
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info("[Router] Circuit closed: primary model recovered")
+            self.state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(f"[Router] Circuit opened after {self._failures} failures; "
+                                   f"using fallback for {self.reset_seconds:.0f}s")
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+
+class ModelRouter:
+    def __init__(self, primary: str, fallback: str, hedge: bool = None):
+        self.primary = primary
+        self.fallback = fallback
+        self.hedge = settings.MODEL_ROUTER_HEDGE_ENABLED if hedge is None else hedge
+        self.breaker = CircuitBreaker()
+        self.latency = {primary: LatencyTracker(), fallback: LatencyTracker()}
+        self.stats = Counter()
+        self._executor = ThreadPoolExecutor(max_workers=settings.ANALYZER_MAX_WORKERS * 2,
+                                            thread_name_prefix='model-router')
+
+    def _timed(self, call: Callable[[str], Optional[str]], model: str) -> Optional[str]:
+        started = time.monotonic()
+        try:
+            text = call(model)
+        except Exception as e:
+            logger.error(f"[Router] {model} call raised: {e}")
+            text = None
+        if text:
+            self.latency[model].add(time.monotonic() - started)
+        if model == self.primary:
+            if text:
+                self.breaker.record_success()
+            else:
+                self.breaker.record_failure()
+        return text
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds to wait on the primary before hedging, or None when hedging is off / not yet calibrated."""
+        if not self.hedge or len(self.latency[self.primary]) < settings.MODEL_ROUTER_HEDGE_MIN_SAMPLES:
+            return None
+        return self.latency[self.primary].percentile(settings.MODEL_ROUTER_HEDGE_QUANTILE)
+
+    def call(self, call: Callable[[str], Optional[str]]) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Runs call(model) -> response text (None on failure) on the primary and/or fallback.
+        Returns (text, model that produced it), or (None, None) if both failed.
+        """
+        if not self.breaker.allow():
+            self.stats['breaker_open'] += 1
+            text = self._timed(call, self.fallback)
+            return (text, self.fallback) if text else (None, None)
+
+        hedge_after = self.hedge_delay()
+        if hedge_after is None:
+            text = self._timed(call, self.primary)
+            if text:
+                self.stats['primary'] += 1
+                return text, self.primary
+            logger.warning(f"Primary model {self.primary} failed. Trying fallback {self.fallback}")
+            text = self._timed(call, self.fallback)
+            if text:
+                self.stats['fallback'] += 1
+                return text, self.fallback
+            return None, None
+
+        futures = {self._executor.submit(self._timed, call, self.primary): self.primary}
+        done, _ = wait(futures, timeout=hedge_after)
+        if not done:
+            self.stats['hedged'] += 1
+            futures[self._executor.submit(self._timed, call, self.fallback)] = self.fallback
+
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                text = future.result()
+                if text:
+                    model = futures[future]
+                    self.stats['primary' if model == self.primary else 'fallback'] += 1
+                    return text, model
+
+        if self.fallback not in futures.values():
+            logger.warning(f"Primary model {self.primary} failed. Trying fallback {self.fallback}")
+            text = self._timed(call, self.fallback)
+            if text:
+                self.stats['fallback'] += 1
+                return text, self.fallback
+        return None, None
+
+    def latency_percentiles(self) -> Dict[str, Dict[str, float]]:
+        return {model: tracker.summary() for model, tracker in self.latency.items()}
+
+    def report(self) -> Dict:
+        return {
+            'breaker': self.breaker.state,
+            'routes': dict(self.stats),
+            'latency': self.latency_percentiles(),
+        }
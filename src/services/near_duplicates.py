@@ -0,0 +1,106 @@
+"""
+Near-duplicate detection for press releases published through several sources
+(joint FSC/FSS releases, MOEF items mirrored on korea.kr, ...).
+
+Each item is reduced to a MinHash signature over character shingles of its
+normalized title; LSH banding finds candidates in O(1) per lookup and the
+signature agreement estimates Jaccard similarity. Only the title is hashed: at
+dedup time scraped items have no body yet and RSS items only a summary, so the
+title is the one field every source (and every stored row) has in the same form.
+"""
+
+import re
+import threading
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import settings
+
+MERSENNE_PRIME = (1 << 61) - 1
+# Source tags such as "[보도자료]", "(보도참고)" differ between copies of the same release.
+# Brackets holding digits are kept: "(10.14~10.18)" is what tells weekly notices apart.
+TAG_PATTERN = re.compile(r'[\[\(<【][^\]\)>】\d]{0,12}[\]\)>】]')
+NON_WORD = re.compile(r'[^0-9a-z가-힣]+')
+
+
+def normalize(title: str) -> str:
+    return NON_WORD.sub('', TAG_PATTERN.sub(' ', (title or '').lower()))
+
+
+class MinHasher:
+    def __init__(self, num_perm: int = None, shingle_size: int = None, seed: int = 1):
+        self.num_perm = num_perm or settings.NEAR_DUP_NUM_PERM
+        self.shingle_size = shingle_size or settings.NEAR_DUP_SHINGLE_SIZE
+        rng_state = seed
+        self._params = []
+        for _ in range(self.num_perm):
+            # Deterministic (a, b) pairs so signatures are comparable across runs
+            rng_state = (rng_state * 6364136223846793005 + 1442695040888963407) % (1 << 64)
+            a = rng_state % MERSENNE_PRIME or 1
+            rng_state = (rng_state * 6364136223846793005 + 1442695040888963407) % (1 << 64)
+            b = rng_state % MERSENNE_PRIME
+            self._params.append((a, b))
+
+    def signature(self, text: str) -> Optional[Tuple[int, ...]]:
+        k = self.shingle_size
+        # Very short titles ("보도자료", "공지") carry too little to compare
+        if len(text) < max(k, settings.NEAR_DUP_MIN_CHARS):
+            return None
+        hashes = {zlib.crc32(text[i:i + k].encode('utf-8')) for i in range(len(text) - k + 1)}
+        return tuple(min((a * h + b) % MERSENNE_PRIME for h in hashes) for a, b in self._params)
+
+    @staticmethod
+    def similarity(sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+        return sum(x == y for x, y in zip(sig_a, sig_b)) / len(sig_a)
+
+
+class NearDuplicateIndex:
+    """
+    LSH index of recent items. add() registers an item under a key with an arbitrary
+    payload (e.g. its stored analysis); query() returns the most similar earlier item.
+    """
+
+    def __init__(self, threshold: float = None, bands: int = None, hasher: MinHasher = None):
+        self.threshold = threshold if threshold is not None else settings.NEAR_DUP_THRESHOLD
+        self.hasher = hasher or MinHasher()
+        self.bands = bands or settings.NEAR_DUP_BANDS
+        self.rows = self.hasher.num_perm // self.bands
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[str]] = {}
+        self._entries: Dict[str, Tuple[Tuple[int, ...], Any]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _bands_of(self, signature: Tuple[int, ...]):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows]
+
+    def add(self, key: str, title: str, payload: Any = None) -> bool:
+        signature = self.hasher.signature(normalize(title))
+        if signature is None:
+            return False
+        with self._lock:
+            self._entries[key] = (signature, payload)
+            for band_key in self._bands_of(signature):
+                self._buckets.setdefault(band_key, []).append(key)
+        return True
+
+    def query(self, title: str, exclude: str = None) -> Optional[Tuple[str, float, Any]]:
+        """Returns (key, estimated similarity, payload) of the closest item above threshold, or None."""
+        signature = self.hasher.signature(normalize(title))
+        if signature is None:
+            return None
+        with self._lock:
+            candidates = set()
+            for band_key in self._bands_of(signature):
+                candidates.update(self._buckets.get(band_key, ()))
+            candidates.discard(exclude)
+
+            best = None
+            for key in candidates:
+                other, payload = self._entries[key]
+                score = self.hasher.similarity(signature, other)
+                if score >= self.threshold and (best is None or score > best[1]):
+                    best = (key, score, payload)
+        return best
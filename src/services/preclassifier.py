@@ -0,0 +1,200 @@
+"""
+Local pre-classifier in front of the Tier-1 gatekeeper.
+
+Hashed character n-grams of "agency | title" feed a logistic regression
+trained offline on historical articles (scripts/admin/train_preclassifier.py).
+It predicts whether Tier 1 would send the article to Tier 2
+(importance_score >= IMPORTANCE_THRESHOLD). Confident negatives (P <= 1 -
+PRECLASSIFIER_CONFIDENCE) replace the API call; confident positives only do so
+with PRECLASSIFIER_SKIP_POSITIVES, once their holdout precision has been checked.
+Everything else still goes to Gemini. Pure Python, the model is a JSON file of
+non-zero weights.
+
+Training rows and live items are turned into model input by the same function
+(example_for). Bodies are not fetched before triage and RSS summaries are not
+stored, so the features are built from agency + title only.
+"""
+
+import json
+import logging
+import math
+import os
+import random
+import zlib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+NGRAM_SIZES = (2, 3)
+DEFAULT_DIMENSIONS = 2 ** 18
+
+
+def featurize(text: str, dimensions: int = DEFAULT_DIMENSIONS) -> Dict[int, float]:
+    """L2-normalized hashed character n-gram counts (crc32, stable across processes)."""
+    text = ' '.join((text or '').lower().split())
+    counts: Dict[int, float] = {}
+    for n in NGRAM_SIZES:
+        for i in range(len(text) - n + 1):
+            index = zlib.crc32(text[i:i + n].encode('utf-8')) % dimensions
+            counts[index] = counts.get(index, 0.0) + 1.0
+    norm = math.sqrt(sum(v * v for v in counts.values()))
+    if norm:
+        for index in counts:
+            counts[index] /= norm
+    return counts
+
+
+def tier1_description(article: Dict) -> str:
+    """Tier 1 input: RSS summary, else the first 200 chars of the body, else the title."""
+    return article.get('description') or (article.get('content') or '')[:200] or article.get('title', '')
+
+
+def example_for(agency_name: str, title: str) -> str:
+    """Model input for an article as seen at triage, identical for training rows and live items."""
+    return f"{agency_name} | {title}"
+
+
+def _sigmoid(z: float) -> float:
+    if z < -30:
+        return 0.0
+    if z > 30:
+        return 1.0
+    return 1.0 / (1.0 + math.exp(-z))
+
+
+class PreClassifier:
+    def __init__(self, weights: Dict[int, float] = None, bias: float = 0.0,
+                 dimensions: int = DEFAULT_DIMENSIONS, metadata: Dict = None):
+        self.weights = weights or {}
+        self.bias = bias
+        self.dimensions = dimensions
+        self.metadata = metadata or {}
+
+    def probability(self, agency_name: str, title: str) -> float:
+        """P(article needs Tier 2)."""
+        features = featurize(example_for(agency_name, title), self.dimensions)
+        return _sigmoid(self.bias + sum(self.weights.get(i, 0.0) * v for i, v in features.items()))
+
+    def predict(self, agency_name: str, title: str,
+                confidence: float = None) -> Tuple[Optional[bool], float]:
+        """
+        Returns (label, probability). label is None when the model is not confident enough
+        for the caller to skip the gatekeeper.
+        """
+        confidence = confidence if confidence is not None else settings.PRECLASSIFIER_CONFIDENCE
+        p = self.probability(agency_name, title)
+        if p >= confidence:
+            return True, p
+        if p <= 1.0 - confidence:
+            return False, p
+        return None, p
+
+    @classmethod
+    def train(cls, examples: List[Tuple[str, int]], epochs: int = 10, learning_rate: float = 0.5,
+              l2: float = 1e-5, dimensions: int = DEFAULT_DIMENSIONS, seed: int = 42) -> 'PreClassifier':
+        """SGD logistic regression over (text, label) pairs with class-balanced sample weights."""
+        rng = random.Random(seed)
+        data = [(featurize(text, dimensions), label) for text, label in examples]
+        positives = sum(label for _, label in data) or 1
+        negatives = (len(data) - positives) or 1
+        class_weight = {1: len(data) / (2.0 * positives), 0: len(data) / (2.0 * negatives)}
+
+        weights: Dict[int, float] = {}
+        bias = 0.0
+        for epoch in range(epochs):
+            rng.shuffle(data)
+            rate = learning_rate / (1 + epoch)
+            for features, label in data:
+                p = _sigmoid(bias + sum(weights.get(i, 0.0) * v for i, v in features.items()))
+                gradient = (p - label) * class_weight[label]
+                bias -= rate * gradient
+                for i, v in features.items():
+                    w = weights.get(i, 0.0)
+                    weights[i] = w - rate * (gradient * v + l2 * w)
+
+        weights = {i: w for i, w in weights.items() if abs(w) > 1e-6}
+        return cls(weights, bias, dimensions, {'examples': len(data), 'positives': positives, 'epochs': epochs})
+
+    def evaluate(self, examples: Iterable[Tuple[str, int]], confidence: float = None) -> Dict[str, float]:
+        """
+        Accuracy over all examples plus coverage/accuracy of the confident subset (the calls saved),
+        split by side: confident negatives are skipped by default, confident positives only
+        with PRECLASSIFIER_SKIP_POSITIVES, so check positive_precision before enabling it.
+        """
+        confidence = confidence if confidence is not None else settings.PRECLASSIFIER_CONFIDENCE
+        total = correct = confident = confident_correct = 0
+        tp = fp = fn = 0
+        neg_confident = neg_correct = pos_confident = pos_correct = 0
+        for text, label in examples:
+            features = featurize(text, self.dimensions)
+            p = _sigmoid(self.bias + sum(self.weights.get(i, 0.0) * v for i, v in features.items()))
+            predicted = int(p >= 0.5)
+            total += 1
+            correct += predicted == label
+            tp += predicted and label
+            fp += predicted and not label
+            fn += (not predicted) and label
+            if p >= confidence or p <= 1.0 - confidence:
+                confident += 1
+                confident_correct += predicted == label
+            if p >= confidence:
+                pos_confident += 1
+                pos_correct += label == 1
+            elif p <= 1.0 - confidence:
+                neg_confident += 1
+                neg_correct += label == 0
+        return {
+            'examples': total,
+            'accuracy': round(correct / total, 4) if total else 0.0,
+            'precision': round(tp / (tp + fp), 4) if tp + fp else 0.0,
+            'recall': round(tp / (tp + fn), 4) if tp + fn else 0.0,
+            'coverage': round(confident / total, 4) if total else 0.0,
+            'confident_accuracy': round(confident_correct / confident, 4) if confident else 0.0,
+            'negative_coverage': round(neg_confident / total, 4) if total else 0.0,
+            'negative_accuracy': round(neg_correct / neg_confident, 4) if neg_confident else 0.0,
+            'positive_coverage': round(pos_confident / total, 4) if total else 0.0,
+            'positive_precision': round(pos_correct / pos_confident, 4) if pos_confident else 0.0,
+        }
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'dimensions': self.dimensions,
+                'ngram_sizes': list(NGRAM_SIZES),
+                'bias': self.bias,
+                'weights': {str(i): round(w, 6) for i, w in self.weights.items()},
+                'metadata': self.metadata,
+            }, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'PreClassifier':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(
+            {int(i): w for i, w in data['weights'].items()},
+            data.get('bias', 0.0),
+            data.get('dimensions', DEFAULT_DIMENSIONS),
+            data.get('metadata'),
+        )
+
+
+def load_preclassifier(path: str = None) -> Optional[PreClassifier]:
+    """Loads the trained model, or None when disabled or not trained yet."""
+    if not settings.PRECLASSIFIER_ENABLED:
+        return None
+    path = path or settings.PRECLASSIFIER_MODEL_PATH
+    if not os.path.exists(path):
+        logger.info(f"Pre-classifier model not found at {path}; every article goes to the gatekeeper")
+        return None
+    try:
+        model = PreClassifier.load(path)
+        logger.info(f"Pre-classifier loaded: {len(model.weights)} weights ({model.metadata})")
+        return model
+    except Exception as e:
+        logger.error(f"Error loading pre-classifier from {path}: {e}")
+        return None
@@ -0,0 +1,83 @@
+"""
+Up-front priority of collected items, from signals that cost no model call:
+agency weight (agencies.json "priority_weight"), safeguard keyword hits in the
+title, category and recency. The streaming pipeline serves higher scores first so
+likely high-impact news is analyzed and alerted before routine notices.
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from config import settings
+from src.services.safeguards import get_safeguard_matcher
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_HIGH = 'high'
+PRIORITY_NORMAL = 'normal'
+PRIORITY_LOW = 'low'
+
+
+def _age_hours(published_at: Optional[str]) -> Optional[float]:
+    if not published_at:
+        return None
+    try:
+        published = datetime.fromisoformat(published_at)
+    except (TypeError, ValueError):
+        return None
+    if published.tzinfo is None:
+        published = published.replace(tzinfo=timezone.utc)
+    return (datetime.now(timezone.utc) - published).total_seconds() / 3600
+
+
+class PriorityScorer:
+    def __init__(self, agency_map: Dict[str, Dict]):
+        self.agency_map = agency_map
+        self.safeguards = get_safeguard_matcher()
+
+    def keyword_score(self, title: str, agency_name: str) -> float:
+        """Best safeguard tier score in the title; routine keywords count against the item."""
+        best, routine = 0, False
+        for m in self.safeguards.match(title):
+            if m['tier'] == 'routine':
+                routine = True
+            elif m['tier'] == 'personnel':
+                rule = self.safeguards.rule('personnel')
+                if any(agency in agency_name for agency in rule.get('agencies', [])):
+                    best = max(best, m['score'] or 0)
+            elif m['score']:
+                best = max(best, m['score'])
+        if routine and not best:
+            return -settings.PRIORITY_ROUTINE_PENALTY
+        return best
+
+    def score(self, item: Dict) -> float:
+        agency = self.agency_map.get(item.get('agency')) or {}
+        agency_name = agency.get('name', item.get('agency', ''))
+
+        score = agency.get('priority_weight', settings.PRIORITY_DEFAULT_AGENCY_WEIGHT)
+        score += settings.PRIORITY_CATEGORY_WEIGHTS.get(item.get('category', 'press_release'), 0)
+        score += self.keyword_score(item.get('title', ''), agency_name)
+
+        age = _age_hours(item.get('published_at'))
+        if age is not None:
+            for max_age, bonus in settings.PRIORITY_RECENCY_BONUS:
+                if age <= max_age:
+                    score += bonus
+                    break
+        return score
+
+    @staticmethod
+    def classify(score: float) -> str:
+        if score >= settings.PRIORITY_HIGH_SCORE:
+            return PRIORITY_HIGH
+        if score >= settings.PRIORITY_NORMAL_SCORE:
+            return PRIORITY_NORMAL
+        return PRIORITY_LOW
+
+    def annotate(self, item: Dict) -> Dict:
+        """Sets item['priority'] and item['priority_class']."""
+        item['priority'] = self.score(item)
+        item['priority_class'] = self.classify(item['priority'])
+        return item
@@ -0,0 +1,171 @@
+"""
+Compiled keyword safeguard rules.
+
+All keyword tiers in config/safeguard_keywords.json are compiled into one
+Aho-Corasick automaton, so a single pass over a title (or a full body) returns
+every matching keyword with its tier, independent of how many keywords there are.
+The file is re-read only when its mtime changes.
+"""
+
+import json
+import logging
+import os
+import threading
+from collections import deque
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'config', 'safeguard_keywords.json')
+
+
+class AhoCorasick:
+    """Multi-pattern substring matcher (case-sensitive)."""
+
+    def __init__(self, patterns: Dict[str, List[str]]):
+        """patterns: keyword -> list of tier names that keyword belongs to."""
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[str]] = [[]]
+        self._tiers = patterns
+
+        for keyword in patterns:
+            if not keyword:
+                continue
+            node = 0
+            for ch in keyword:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append(keyword)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find_all(self, text: str) -> List[tuple]:
+        """Returns (position, keyword) for every occurrence in text."""
+        matches = []
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            for keyword in self._out[node]:
+                matches.append((i - len(keyword) + 1, keyword))
+        return matches
+
+    def tiers_of(self, keyword: str) -> List[str]:
+        return self._tiers.get(keyword, [])
+
+
+class SafeguardMatcher:
+    """
+    Rule engine over safeguard_keywords.json.
+
+    Every top-level block with a "keywords" list is a tier, e.g.
+    {"high_importance": {"score": 5, "keywords": [...], "match_body": ["CCyB", ...]}}.
+    "match_body" is true (every keyword counts in the body), false (title only) or a list
+    of the keywords specific enough to count in the body as well.
+    match() returns one dict per occurrence: {keyword, tier, score, field, position}.
+    """
+
+    def __init__(self, path: str = CONFIG_PATH):
+        self.path = path
+        self._mtime: Optional[float] = None
+        self._rules: Dict[str, Dict] = {}
+        self._automaton = AhoCorasick({})
+        self._lock = threading.Lock()
+        self._reload_if_changed()
+
+    def _reload_if_changed(self):
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return
+        if mtime == self._mtime:
+            return
+
+        with self._lock:
+            if mtime == self._mtime:
+                return
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    rules = json.load(f)
+            except Exception as e:
+                logger.error(f"Error loading safeguards from {self.path}: {e}")
+                return
+
+            patterns: Dict[str, List[str]] = {}
+            tiers = {}
+            for tier, block in rules.items():
+                if not isinstance(block, dict) or 'keywords' not in block:
+                    continue
+                tiers[tier] = block
+                for keyword in block.get('keywords', []):
+                    patterns.setdefault(keyword, []).append(tier)
+
+            self._automaton = AhoCorasick(patterns)
+            self._rules = tiers
+            self._mtime = mtime
+            logger.info(f"🛡️ Safeguard rules compiled: {len(patterns)} keywords in {len(tiers)} tiers")
+
+    def rule(self, tier: str) -> Dict:
+        self._reload_if_changed()
+        return self._rules.get(tier, {})
+
+    def counts_in_body(self, tier: str, keyword: str) -> bool:
+        """Whether a body occurrence of `keyword` may act for `tier` (see "match_body")."""
+        match_body = self.rule(tier).get('match_body')
+        if isinstance(match_body, list):
+            return keyword in match_body
+        return bool(match_body)
+
+    def match(self, title: str, body: Optional[str] = None) -> List[Dict]:
+        """
+        Scans title and (optionally) body in one pass each.
+        Body matches are returned for every tier; callers decide which tiers
+        may act on body text via the tier's "match_body" flag.
+        """
+        self._reload_if_changed()
+        automaton, rules = self._automaton, self._rules
+
+        matches = []
+        for field, text in (('title', title), ('body', body)):
+            if not text:
+                continue
+            for position, keyword in automaton.find_all(text):
+                for tier in automaton.tiers_of(keyword):
+                    matches.append({
+                        'keyword': keyword,
+                        'tier': tier,
+                        'score': rules.get(tier, {}).get('score'),
+                        'field': field,
+                        'position': position,
+                    })
+        return matches
+
+
+_shared_matcher: Optional[SafeguardMatcher] = None
+_shared_lock = threading.Lock()
+
+
+def get_safeguard_matcher() -> SafeguardMatcher:
+    """Returns the process-wide matcher (compiled once, hot-reloaded on file change)."""
+    global _shared_matcher
+    with _shared_lock:
+        if _shared_matcher is None:
+            _shared_matcher = SafeguardMatcher()
+        return _shared_matcher
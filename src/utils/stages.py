@@ -0,0 +1,183 @@
+"""
+Minimal staged producer/consumer runner.
+
+Stages are declared in pipeline order and connected by bounded queues. Any
+handler may forward items to any *later* stage with StagedRunner.put(), so items
+flow downstream as soon as they are produced. A stage is closed once every
+earlier stage has finished and its own queue has drained. A stage with a
+priority function serves its highest-priority items first instead of FIFO.
+"""
+
+import itertools
+
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+class Stage:
+    def __init__(self, name: str, handler: Callable, workers: int = 1, maxsize: int = 0,
+                 batch_size: int = 1, linger: float = 0.0,
+                 idle_timeout: Optional[float] = None, on_idle: Optional[Callable[[], None]] = None,
+                 on_close: Optional[Callable[[], None]] = None,
+                 priority: Optional[Callable[[Any], float]] = None):
+        """
+        handler(item) for batch_size == 1, handler(list_of_items) otherwise: a batch is
+        the first available item plus whatever else arrives within `linger` seconds.
+        on_idle is called by a worker whenever its queue stayed empty for idle_timeout seconds;
+        on_close once after the last worker exited (it may still put() into later stages).
+        priority(item) -> number turns the queue into a priority queue (higher first, FIFO among equals).
+        """
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.linger = linger
+        self.idle_timeout = idle_timeout
+        self.on_idle = on_idle
+        self.on_close = on_close
+        self.priority = priority
+        self.queue: queue.Queue = queue.PriorityQueue(maxsize) if priority else queue.Queue(maxsize)
+        self._sequence = itertools.count()
+
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self.received = 0
+        self.processed = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self.max_depth = 0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def _put(self, item: Any):
+        if self.priority is None:
+            self.queue.put(item)
+        elif item is _DONE:
+            # Sentinels sort after every real item
+            self.queue.put((float('inf'), next(self._sequence), item))
+        else:
+            self.queue.put((-self.priority(item), next(self._sequence), item))
+
+    def _take(self, timeout: Optional[float] = None) -> Any:
+        entry = self.queue.get(timeout=timeout)
+        return entry if self.priority is None else entry[2]
+
+    def put(self, item: Any):
+        self._put(item)
+        with self._lock:
+            self.received += 1
+            self.max_depth = max(self.max_depth, self.queue.qsize())
+
+    def _get(self):
+        if self.idle_timeout is None:
+            return self._take()
+        while True:
+            try:
+                return self._take(timeout=self.idle_timeout)
+            except queue.Empty:
+                if self.on_idle:
+                    try:
+                        self.on_idle()
+                    except Exception as e:
+                        logger.error(f"[{self.name}] idle hook failed: {e}")
+
+    def _next_batch(self):
+        """Returns the next list of items to handle, or _DONE."""
+        first = self._get()
+        if first is _DONE:
+            return _DONE
+        batch = [first]
+        deadline = time.monotonic() + self.linger
+        while len(batch) < self.batch_size:
+            try:
+                item = self._take(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if item is _DONE:
+                # Leave the sentinel for this (or another) worker after the batch
+                self._put(item)
+                break
+            batch.append(item)
+        return batch
+
+    def _work(self):
+        while True:
+            batch = self._next_batch()
+            if batch is _DONE:
+                return
+            started = time.monotonic()
+            try:
+                self.handler(batch if self.batch_size > 1 else batch[0])
+            except Exception as e:
+                with self._lock:
+                    self.errors += len(batch)
+                logger.error(f"[{self.name}] stage handler failed: {e}")
+            with self._lock:
+                self.busy_seconds += time.monotonic() - started
+                self.processed += len(batch)
+
+    def start(self):
+        self.started_at = time.monotonic()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"stage-{self.name}-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def close(self):
+        """Sends one sentinel per worker and waits for the workers to drain the queue."""
+        for _ in self._threads:
+            self._put(_DONE)
+        for thread in self._threads:
+            thread.join()
+        if self.on_close:
+            try:
+                self.on_close()
+            except Exception as e:
+                logger.error(f"[{self.name}] close hook failed: {e}")
+        self.finished_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            elapsed = ((self.finished_at or time.monotonic()) - self.started_at) if self.started_at else 0.0
+            return {
+                'workers': self.workers,
+                'received': self.received,
+                'processed': self.processed,
+                'errors': self.errors,
+                'queue_depth': self.queue.qsize(),
+                'max_queue_depth': self.max_depth,
+                'busy_seconds': round(self.busy_seconds, 2),
+                'items_per_second': round(self.processed / elapsed, 2) if elapsed else 0.0,
+            }
+
+
+class StagedRunner:
+    def __init__(self, stages: List[Stage]):
+        self.stages = stages
+        self._by_name = {stage.name: stage for stage in stages}
+
+    def put(self, stage_name: str, item: Any):
+        self._by_name[stage_name].put(item)
+
+    def run(self, source: Callable[[], None]):
+        """
+        Starts all stages, runs source() in the calling thread (it feeds the first
+        stages via put()), then closes the stages in order.
+        """
+        for stage in self.stages:
+            stage.start()
+        try:
+            source()
+        finally:
+            for stage in self.stages:
+                stage.close()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {stage.name: stage.stats() for stage in self.stages}
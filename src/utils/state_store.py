@@ -0,0 +1,56 @@
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class JsonStateStore:
+    """
+    Small persistent key/value store backed by a JSON file in STATE_DIR.
+    Used for collector state that must survive between cycles (feed validators etc.).
+    Writes are atomic (temp file + rename) and guarded by a lock for threaded collectors.
+    """
+
+    def __init__(self, name: str, state_dir: str = None):
+        self.path = os.path.join(state_dir or settings.STATE_DIR, f"{name}.json")
+        self._lock = threading.Lock()
+        self._data: Dict[str, Any] = self._load()
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Failed to load state file {self.path}, starting empty: {e}")
+            return {}
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            return self._data.get(key, default)
+
+    def set(self, key: str, value: Any, save: bool = True):
+        with self._lock:
+            self._data[key] = value
+            if save:
+                self._save_locked()
+
+    def save(self):
+        with self._lock:
+            self._save_locked()
+
+    def _save_locked(self):
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error(f"Failed to save state file {self.path}: {e}")